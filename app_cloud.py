@@ -1,11 +1,32 @@
 
 # app_cloud.py (versão para Streamlit Cloud)
+
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import os, re
+
+from controle_chamados.consulta import agregar, aplicar_filtros, assinatura_agregado
+from controle_chamados.delta import MONITOR
+from controle_chamados.esquema import COLUNAS_BASE, COLUNAS_CHAVE_VAZIAS, relatorio_memoria
+from controle_chamados.exportacao import FORMATOS_EXPORTACAO
+from controle_chamados.filtros import MemoFiltros, assinatura_filtros, montar_selecoes
+from controle_chamados.indicadores import calcular_indicadores
+from controle_chamados.ingestao import cabecalho_aba, manifesto_excel
+from controle_chamados.memoria import ativar_copy_on_write
+from controle_chamados.multiano import COLUNA_ANO, descobrir_arquivos_anuais
+from controle_chamados.paginacao import TAMANHOS_PAGINA, ordem_filtrada, pagina, total_paginas
+from controle_chamados.prazo import COL_DIAS_ATRASO, COL_SITUACAO_PRAZO, histograma_atraso
+from controle_chamados.saneamento import CACHE_BASES, EXIGIR_PADRAO, chave_exigir
+from controle_chamados.sla import DIMENSOES_SLA, ETAPAS_SLA, percentis_sla
+from controle_chamados.ui_cache import (
+    aquecimento, carregar_base, carregar_base_multiano, cubo_base, download_sob_demanda, exportar_filtrado, figura_atraso,
+    figuras_agregado, indice_busca_base, invalidar_versao, motor_filtros_base, opcoes_filtros_base, ordem_base_cache,
+    plotly_express, progresso_aquecimento, tabela_moeda,
+)
 
 st.set_page_config(page_title="Controle de Chamados - Engenharia", layout="wide")
+# a base é compartilhada entre as sessões: copy-on-write ligado antes de carregá-la
+ativar_copy_on_write()
 
 PALETA = {
     "primaria": "#0A6EB5",
@@ -49,199 +70,28 @@ CAMINHO_EXCEL = "BASE_CONTROLE.xlsx"  # coloque este arquivo junto ao app
 ABA_PADRAO = "SOLICITAÇÃO DE PAGAMENTO"
 
 # =========================
-# COLUNAS
-# =========================
-COLUNAS_BASE = [
-    "EMP","FILIAL","LOJA","CNPJ","COORDENADOR","PROJETO","SERVIÇO","NOTA","FORNECEDOR",
-    "VALOR RC","VALOR A PAGAR","VALOR BI","STATUS RC","PEDIDO","CHAMADO","DATA_PGTO_SAP",
-    "MIRO","STATUS RESULT1","DATA CRIAÇÃO TICKET","PRAZO"
-]
-
-COLUNAS_CHAVE_VAZIAS = [
-    "EMP","FILIAL","LOJA","CNPJ","COORDENADOR","PROJETO","SERVIÇO","NOTA","FORNECEDOR",
-    "STATUS RC","PEDIDO","CHAMADO","STATUS RESULT1","PRAZO"
-]
-
-# =========================
-# HELPERS DE DADOS
+# GRÁFICOS
 # =========================
+# caches, aquecimento e invalidação por versão vêm de controle_chamados.ui_cache (mesmo código do app_cloud_pretty.py);
+# aqui fica só o visual das figuras
+def montar_figuras_agregado(px, agreg: pd.DataFrame, ordenar_por: str) -> tuple:
+    fig_bar = px.bar(
+        agreg, x=agreg.columns[0], y=ordenar_por, text=ordenar_por, color=agreg.columns[0],
+        title=f"{ordenar_por} por {agreg.columns[0]}", height=400
+    )
+    fig_pie = px.pie(
+        agreg, names=agreg.columns[0], values="QTD_TICKETS",
+        title=f"Distribuição de tickets por {agreg.columns[0]}", hole=0.45, height=400
+    )
+    return fig_bar, fig_pie
 
-def listar_abas_excel(caminho_excel: str) -> list:
-    if not os.path.exists(caminho_excel):
-        raise FileNotFoundError(f"Arquivo não encontrado: {caminho_excel}")
-    if caminho_excel.lower().endswith(".xlsx"):
-        xls = pd.ExcelFile(caminho_excel, engine="openpyxl")
-        return xls.sheet_names
-    elif caminho_excel.lower().endswith(".xls"):
-        xls = pd.ExcelFile(caminho_excel, engine="xlrd")
-        return xls.sheet_names
-    else:
-        return ["(arquivo CSV - sem abas)"]
-
-
-def to_numeric_safe(x) -> float:
-    try:
-        s = str(x).strip()
-        if s == "" or s.lower() in {"nan", "none"}:
-            return float("nan")
-        s = re.sub(r"[^\d\.,\-]", "", s)
-        if "," in s and "." in s:
-            s = s.replace(".", "").replace(",", ".")
-        elif "," in s and "." not in s:
-            s = s.replace(",", ".")
-        return float(s)
-    except Exception:
-        return float("nan")
-
-
-def formatar_moeda_val(x) -> str:
-    try:
-        val = to_numeric_safe(x)
-        if pd.notna(val):
-            s = f"R${val:,.2f}"
-            return s.replace(",", "X").replace(".", ",").replace("X", ".")
-        return ""
-    except Exception:
-        return ""
-
-
-def formatar_moeda_df(df: pd.DataFrame, cols: list) -> pd.DataFrame:
-    f = df.copy()
-    for c in cols:
-        if c in f.columns:
-            f[c] = f[c].apply(formatar_moeda_val)
-    return f
-
-
-def limpar_vazios_texto(df: pd.DataFrame, cols: list) -> pd.DataFrame:
-    f = df.copy()
-    for c in cols:
-        if c in f.columns:
-            f[c] = f[c].astype(str).str.strip()
-            f[c] = f[c].replace({"": pd.NA, "nan": pd.NA, "None": pd.NA, "NONE": pd.NA})
-    return f
-
-
-def filtrar_linhas_uteis(df: pd.DataFrame, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool = True) -> pd.DataFrame:
-    f = df.copy()
-    if aplicar_drop_all_empty:
-        chaves_presentes = [c for c in COLUNAS_CHAVE_VAZIAS if c in f.columns]
-        if chaves_presentes:
-            f = f.dropna(subset=chaves_presentes, how="all")
-    if exigir_qualquer_preenchido:
-        campos = [c for c in exigir_qualquer_preenchido if c in f.columns]
-        if campos:
-            mask = False
-            for c in campos:
-                mask = (mask | (f[c].notna()))
-            f = f[mask]
-    return f
-
-@st.cache_data(show_spinner=True)
-def carregar_base(caminho_excel: str, aba: str, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool) -> pd.DataFrame:
-    if not os.path.exists(caminho_excel):
-        raise FileNotFoundError(f"Arquivo não encontrado: {caminho_excel}")
-    if caminho_excel.lower().endswith(".xlsx"):
-        xls = pd.ExcelFile(caminho_excel, engine="openpyxl")
-        if aba not in xls.sheet_names:
-            raise ValueError(f"Aba '{aba}' não encontrada. Abas disponíveis: {xls.sheet_names}")
-        df = pd.read_excel(xls, sheet_name=aba)
-    elif caminho_excel.lower().endswith(".xls"):
-        xls = pd.ExcelFile(caminho_excel, engine="xlrd")
-        if aba not in xls.sheet_names:
-            raise ValueError(f"Aba '{aba}' não encontrada. Abas disponíveis: {xls.sheet_names}")
-        df = pd.read_excel(xls, sheet_name=aba)
-    else:
-        df = pd.read_csv(caminho_excel, sep=";", encoding="utf-8")
-
-    df.columns = [str(c).strip().upper() for c in df.columns]
-    df = limpar_vazios_texto(df, list(set(COLUNAS_CHAVE_VAZIAS + COLUNAS_BASE)))
-
-    for c in ["DATA_PGTO_SAP","DATA CRIAÇÃO TICKET","DATA CRIAÇÃO RC","DATA CRIAÇÃO TICKET BR"]:
-        if c in df.columns:
-            try:
-                df[c] = pd.to_datetime(df[c], errors="coerce")
-            except Exception:
-                pass
-
-    df = filtrar_linhas_uteis(df, exigir_qualquer_preenchido, aplicar_drop_all_empty)
-    return df
-
-
-def aplicar_filtros(df: pd.DataFrame, coord_sel, forn_sel, projeto_sel, status_ticket_sel, status_pgto_sel,
-                    status_rc_sel, prazo_sel, prazo_texto, loja_texto, pedido_texto, busca_texto):
-    f = df.copy()
-    if coord_sel and "COORDENADOR" in f.columns:
-        f = f[f["COORDENADOR"].isin(coord_sel)]
-    if forn_sel and "FORNECEDOR" in f.columns:
-        f = f[f["FORNECEDOR"].isin(forn_sel)]
-    if projeto_sel and "PROJETO" in f.columns:
-        f = f[f["PROJETO"].isin(projeto_sel)]
-    if status_rc_sel and "STATUS RC" in f.columns:
-        f = f[f["STATUS RC"].isin(status_rc_sel)]
-    if status_ticket_sel and "CHAMADO" in f.columns:
-        f = f[f["CHAMADO"].isin(status_ticket_sel)]
-    if status_pgto_sel and "STATUS RESULT1" in f.columns:
-        f = f[f["STATUS RESULT1"].isin(status_pgto_sel)]
-    if prazo_sel and "PRAZO" in f.columns:
-        f = f[f["PRAZO"].isin(prazo_sel)]
-    if prazo_texto and "PRAZO" in f.columns:
-        f = f[f["PRAZO"].astype(str).str.contains(prazo_texto, na=False, case=False)]
-    if loja_texto and "LOJA" in f.columns:
-        f = f[f["LOJA"].astype(str).str.contains(loja_texto, na=False, case=False)]
-    if pedido_texto and "PEDIDO" in f.columns:
-        f = f[f["PEDIDO"].astype(str).str.contains(pedido_texto, na=False, case=False)]
-    if busca_texto:
-        q = busca_texto.lower()
-        f = f[f.apply(lambda r: q in (" ".join(r.astype(str))).lower(), axis=1)]
-    return f
-
-
-def agregar(df: pd.DataFrame, eixo: str, ref_data_col: str = None, excluir_nulos_eixo: bool = False) -> pd.DataFrame:
-    f = df.copy()
-    if eixo == "MÊS":
-        if ref_data_col not in f.columns:
-            raise ValueError(f"A coluna de data '{ref_data_col}' não existe.")
-        f["_REF_DATA"] = pd.to_datetime(f[ref_data_col], errors="coerce")
-        f["MÊS"] = f["_REF_DATA"].dt.strftime("%Y-%m")
-        grupo = "MÊS"
-        if excluir_nulos_eixo:
-            f = f[f["MÊS"].notna()]
-    elif eixo == "PROJETO":
-        if "PROJETO" not in f.columns:
-            raise ValueError("Coluna 'PROJETO' não encontrada.")
-        grupo = "PROJETO"
-        if excluir_nulos_eixo:
-            f = f[f["PROJETO"].notna() & (f["PROJETO"].astype(str).str.strip() != "")]
-    elif eixo == "COORDENADOR":
-        if "COORDENADOR" not in f.columns:
-            raise ValueError("Coluna 'COORDENADOR' não encontrada.")
-        grupo = "COORDENADOR"
-        if excluir_nulos_eixo:
-            f = f[f["COORDENADOR"].notna() & (f["COORDENADOR"].astype(str).str.strip() != "")]
-    else:
-        raise ValueError("Eixo inválido. Use 'MÊS', 'PROJETO' ou 'COORDENADOR'.")
-
-    for c in ["VALOR RC","VALOR A PAGAR","VALOR BI"]:
-        if c in f.columns:
-            f[c] = f[c].apply(to_numeric_safe).fillna(0)
 
-    agreg = f.groupby(grupo, dropna=False).agg({
-        "VALOR RC": "sum" if "VALOR RC" in f.columns else "size",
-        "VALOR A PAGAR": "sum" if "VALOR A PAGAR" in f.columns else "size",
-        "VALOR BI": "sum" if "VALOR BI" in f.columns else "size",
-        grupo: "size"
-    }).rename(columns={grupo: "QTD_TICKETS"}).reset_index()
+def montar_figura_atraso(px, hist: pd.DataFrame):
+    return px.bar(
+        hist, x="DIAS DE ATRASO", y="QTD_TICKETS", text="QTD_TICKETS",
+        title="Tickets fora do prazo por dias de atraso", height=400
+    )
 
-    if eixo == "MÊS":
-        try:
-            agreg["_ORD"] = pd.to_datetime(agreg["MÊS"] + "-01", errors="coerce")
-            agreg = agreg.sort_values("_ORD", ascending=True).drop(columns=["_ORD"])
-        except Exception:
-            agreg = agreg.sort_values("MÊS", ascending=True)
-    else:
-        agreg = agreg.sort_values("QTD_TICKETS", ascending=False)
-    return agreg
 
 # =========================
 # UI
@@ -254,74 +104,112 @@ with col_titulo:
 with col_search:
     busca_header = st.text_input("Ex.: coordenador, fornecedor, nota, loja, ped")
 
-c_diag1, c_diag2, c_diag3 = st.columns([2,1,1])
+c_diag1, c_diag2 = st.columns([3,1])
 with c_diag1:
-    st.info("✨ Use o .BAT. Se atualizar a planilha, substitua o arquivo no GitHub e clique em **Atualizar cache**.")
+    st.info("✨ Use o .BAT. Se atualizar a planilha, substitua o arquivo no GitHub: a mudança é detectada e só as linhas alteradas são recarregadas.")
 with c_diag2:
-    if st.button("Atualizar cache"):
-        st.cache_data.clear()
-        safe_rerun()
-with c_diag3:
     mostrar_debug = st.checkbox("Debug (ver status da base)")
 
 with st.expander("🧪 Seleção da aba / Saneamento da base"):
     st.write(f"**Arquivo:** `{CAMINHO_EXCEL}`")
     try:
-        abas = listar_abas_excel(CAMINHO_EXCEL)
+        # nomes e dimensões vêm do manifesto do .xlsx (cache por versão do arquivo), sem abrir a pasta de trabalho
+        manifesto = manifesto_excel(CAMINHO_EXCEL)
+        abas = list(manifesto)
         idx_default = abas.index(ABA_PADRAO) if ABA_PADRAO in abas else 0
         aba_sel = st.selectbox("Aba do Excel", abas, index=idx_default)
+        if manifesto.get(aba_sel):
+            st.caption(f"Dimensão da aba: até {manifesto[aba_sel]['linhas'] - 1:,} linhas × {manifesto[aba_sel]['colunas']} colunas".replace(",", "."))
     except Exception as e:
-        st.error(f"Falha ao listar abas.
-
-**Erro**: {e}")
+        st.error(f"Falha ao listar abas.\n\n**Erro**: {e}")
         aba_sel = ABA_PADRAO
 
     aplicar_drop_all_empty = st.checkbox("Remover linhas totalmente vazias (recomendado)", value=True)
-    exigir_campos = st.multiselect(
+    exigir_campos = chave_exigir(st.multiselect(
         "Exigir que ao menos um destes campos esteja preenchido",
         options=[c for c in COLUNAS_CHAVE_VAZIAS if c != "PRAZO"],
-        default=[c for c in ["FORNECEDOR","COORDENADOR","PROJETO","PEDIDO","NOTA"] if c in COLUNAS_CHAVE_VAZIAS]
-    )
+        default=EXIGIR_PADRAO
+    ))
     st.caption("Evita contar linhas lixo com formatação ou fórmulas sem dados.")
 
+    arquivos_anuais = descobrir_arquivos_anuais(CAMINHO_EXCEL)
+    visao_multiano = st.checkbox(
+        "Visão multi-ano (consolidar arquivos anuais)", value=False, disabled=not arquivos_anuais,
+        help="Junta os arquivos BASE ..._AAAA.xlsx da mesma pasta, com a coluna ANO."
+    )
+    if arquivos_anuais:
+        st.caption("Arquivos anuais encontrados: " + ", ".join(str(a) for a in arquivos_anuais))
+
+# enquanto o aquecimento prepara a configuração padrão, mostra o progresso em vez de travar a sessão
+aquec = aquecimento(CAMINHO_EXCEL, ABA_PADRAO, ("DATA_PGTO_SAP", "DATA CRIAÇÃO TICKET BR", "DATA CRIAÇÃO TICKET", "DATA CRIAÇÃO RC"), False)
+plotly_express()
+configuracao_padrao = not visao_multiano and aba_sel == ABA_PADRAO and aplicar_drop_all_empty and exigir_campos == chave_exigir(EXIGIR_PADRAO)
+if configuracao_padrao and not aquec.pronto.is_set():
+    progresso_aquecimento(aquec)
+    st.stop()
+
 try:
-    df = carregar_base(CAMINHO_EXCEL, aba_sel, exigir_campos, aplicar_drop_all_empty)
+    # impressão digital da planilha: stat a cada rerun, hash do conteúdo só quando o stat muda
+    if visao_multiano and arquivos_anuais:
+        versoes = {}
+        for ano, arq in arquivos_anuais.items():
+            versoes[ano], versao_antiga = MONITOR.verificar(arq)
+            if versao_antiga:
+                invalidar_versao(arq, versao_antiga)
+        df = carregar_base_multiano(arquivos_anuais, aba_sel, exigir_campos, aplicar_drop_all_empty, versoes)
+        versao_base = "multiano:" + "|".join(f"{ano}={v}" for ano, v in versoes.items())
+    else:
+        versao_base, versao_antiga = MONITOR.verificar(CAMINHO_EXCEL)
+        if versao_antiga:
+            invalidar_versao(CAMINHO_EXCEL, versao_antiga)
+        df = carregar_base(CAMINHO_EXCEL, aba_sel, exigir_campos, aplicar_drop_all_empty, versao_base)
 except Exception as e:
-    st.error(f"❌ Não consegui abrir a base.
-
-**Erro**: {e}")
+    st.error(f"❌ Não consegui abrir a base.\n\n**Erro**: {e}")
     st.stop()
 
 if mostrar_debug:
-    st.success(f"✅ Base lida: **{CAMINHO_EXCEL}**  
- Aba: **{aba_sel}**")
-    st.write(f"**Linhas (após saneamento):** {len(df)}  
- **Colunas:** {len(df.columns)}")
+    st.success(f"✅ Base lida: **{CAMINHO_EXCEL}**  \n Aba: **{aba_sel}**")
+    st.write(f"**Linhas (após saneamento):** {len(df)}  \n **Colunas:** {len(df.columns)}")
+    memoria = relatorio_memoria(df)
+    st.write(f"**Memória da base (compartilhada entre as sessões):** {memoria['BYTES'].sum() / 2**20:.1f} MB "
+             f"(economia do esquema: {memoria['ECONOMIA'].sum() / 2**20:.1f} MB)")
+    st.dataframe(memoria, use_container_width=True, hide_index=True)
+    cache = CACHE_BASES.resumo()
+    st.write(f"**Cache de bases (LRU):** {cache['entradas']} entradas · {cache['bytes'] / 2**20:.1f} de {cache['limite_bytes'] / 2**20:.0f} MB "
+             f"· {cache['acertos']} acertos / {cache['faltas']} faltas")
+    if df.attrs.get("delta"):
+        d = df.attrs["delta"]
+        st.write(f"**Recarga incremental:** {d['inseridos']} inseridas · {d['atualizados']} alteradas · {d['removidos']} removidas")
     st.write("**Colunas (até 50):**", df.columns.tolist()[:50])
+    if not visao_multiano:
+        ausentes = [c for c in COLUNAS_BASE if c not in cabecalho_aba(CAMINHO_EXCEL, aba_sel)]
+        st.write("**Colunas do schema ausentes no cabeçalho da aba:**", ausentes or "nenhuma")
     st.dataframe(df.head(5), use_container_width=True)
 
 if df.empty:
-    st.warning("⚠️ A aba selecionada, após saneamento, ficou **vazia**. Ajuste os critérios e clique em **Atualizar cache**.")
+    st.warning("⚠️ A aba selecionada, após saneamento, ficou **vazia**. Ajuste os critérios de saneamento.")
     st.stop()
 
-colunas = df.columns.tolist()
+opcoes = opcoes_filtros_base(CAMINHO_EXCEL, aba_sel, exigir_campos, aplicar_drop_all_empty, versao_base, df)
 
 st.sidebar.header("Filtros")
-coord = st.sidebar.multiselect("Coordenador", sorted(df["COORDENADOR"].dropna().unique().tolist())) if "COORDENADOR" in colunas else []
-forn = st.sidebar.multiselect("Fornecedor", sorted(df["FORNECEDOR"].dropna().unique().tolist())) if "FORNECEDOR" in colunas else []
-projeto = st.sidebar.multiselect("Projeto", sorted(df["PROJETO"].dropna().unique().tolist())) if "PROJETO" in colunas else []
-status_rc = st.sidebar.multiselect("Status RC", sorted(df["STATUS RC"].dropna().unique().tolist())) if "STATUS RC" in colunas else []
-status_ticket = st.sidebar.multiselect("Status do Ticket", sorted(df["CHAMADO"].dropna().unique().tolist())) if "CHAMADO" in colunas else []
-status_pgto = st.sidebar.multiselect("Status de Pagamento", sorted(df["STATUS RESULT1"].dropna().unique().tolist())) if "STATUS RESULT1" in colunas else []
-
-prazo_opcoes = []
-if "PRAZO" in colunas:
-    base_prazo = df["PRAZO"].dropna().astype(str)
-    sugestao = ["no prazo", "fora do prazo"]
-    prazo_opcoes = sorted(set(sugestao + base_prazo.unique().tolist()))
+coord = st.sidebar.multiselect("Coordenador", opcoes["COORDENADOR"]) if "COORDENADOR" in opcoes else []
+forn = st.sidebar.multiselect("Fornecedor", opcoes["FORNECEDOR"]) if "FORNECEDOR" in opcoes else []
+projeto = st.sidebar.multiselect("Projeto", opcoes["PROJETO"]) if "PROJETO" in opcoes else []
+status_rc = st.sidebar.multiselect("Status RC", opcoes["STATUS RC"]) if "STATUS RC" in opcoes else []
+status_ticket = st.sidebar.multiselect("Status do Ticket", opcoes["CHAMADO"]) if "CHAMADO" in opcoes else []
+status_pgto = st.sidebar.multiselect("Status de Pagamento", opcoes["STATUS RESULT1"]) if "STATUS RESULT1" in opcoes else []
+
+prazo_opcoes = opcoes.get("PRAZO", [])
 
 prazo_sel = st.sidebar.multiselect("Prazo (valores exatos)", prazo_opcoes) if prazo_opcoes else []
 prazo_texto = st.sidebar.text_input("Prazo (contém texto)", placeholder='Ex.: "13 dias"')
+situacao_prazo = st.sidebar.multiselect("Situação do prazo", opcoes[COL_SITUACAO_PRAZO]) if COL_SITUACAO_PRAZO in opcoes else []
+atraso_faixa = None
+if COL_DIAS_ATRASO in opcoes and opcoes[COL_DIAS_ATRASO][0] < opcoes[COL_DIAS_ATRASO][1]:
+    escolhida = st.sidebar.slider("Dias de atraso (fora do prazo)", *opcoes[COL_DIAS_ATRASO], value=opcoes[COL_DIAS_ATRASO])
+    # faixa inteira = sem restrição (não esconde as linhas no prazo)
+    atraso_faixa = None if escolhida == opcoes[COL_DIAS_ATRASO] else escolhida
 loja = st.sidebar.text_input("Número da Loja (ex.: 1427)")
 pedido = st.sidebar.text_input("Número do Pedido")
 busca_livre = st.sidebar.text_input("Busca livre (coordenador, fornecedor, nota, etc.)")
@@ -329,125 +217,180 @@ busca_livre = st.sidebar.text_input("Busca livre (coordenador, fornecedor, nota,
 c1, c2 = st.sidebar.columns(2)
 with c1:
     if st.button("Limpar filtros"):
-        loja = ""; pedido = ""; busca_livre = ""; prazo_sel = []; prazo_texto = ""
+        loja = ""; pedido = ""; busca_livre = ""; prazo_sel = []; prazo_texto = ""; situacao_prazo = []; atraso_faixa = None
         clear_query_params()
 with c2:
     reset_cols = st.button("Colunas recomendadas")
 
-filtrado = aplicar_filtros(
-    df=df,
-    coord_sel=coord,
-    forn_sel=forn,
-    projeto_sel=projeto,
-    status_ticket_sel=status_ticket,
-    status_pgto_sel=status_pgto,
-    status_rc_sel=status_rc,
-    prazo_sel=prazo_sel,
-    prazo_texto=prazo_texto,
-    loja_texto=loja,
-    pedido_texto=pedido,
-    busca_texto=(busca_header or busca_livre)
-)
+try:
+    filtrado = aplicar_filtros(
+        df=df,
+        coord_sel=coord,
+        forn_sel=forn,
+        projeto_sel=projeto,
+        status_ticket_sel=status_ticket,
+        status_pgto_sel=status_pgto,
+        status_rc_sel=status_rc,
+        prazo_sel=prazo_sel,
+        prazo_texto=prazo_texto,
+        loja_texto=loja,
+        pedido_texto=pedido,
+        busca_texto=(busca_header or busca_livre),
+        situacao_prazo_sel=situacao_prazo,
+        atraso_faixa=atraso_faixa,
+        indice_busca=(
+            indice_busca_base(CAMINHO_EXCEL, aba_sel, exigir_campos, aplicar_drop_all_empty, versao_base, df)
+            if (busca_header or busca_livre) else None
+        ),
+        motor=motor_filtros_base(CAMINHO_EXCEL, aba_sel, exigir_campos, aplicar_drop_all_empty, versao_base, df),
+        # posições do resultado guardadas na sessão: trocar eixo/ordenação/página não refaz o filtro
+        memo=st.session_state.setdefault("memo_filtros", MemoFiltros()),
+        versao=(CAMINHO_EXCEL, aba_sel, exigir_campos, aplicar_drop_all_empty, versao_base)
+    )
+except ValueError as e:
+    # ex.: regex inválida num filtro de texto
+    st.error(f"❌ Filtro inválido.\n\n**Erro**: {e}")
+    st.stop()
+if mostrar_debug:
+    st.caption(f"Resultado dos filtros: {st.session_state['memo_filtros'].ultimo} (memo = guardado na sessão, refinado = avaliado só no recorte anterior)")
 
 st.subheader("Indicadores")
 kp1, kp2, kp3, kp4 = st.columns(4)
 
-total_reg = len(filtrado)
-no_prazo = None; fora_prazo = None
-if "PRAZO" in filtrado.columns:
-    prazos_norm = filtrado["PRAZO"].astype(str).str.lower()
-    no_prazo = prazos_norm.str.startswith("no prazo").sum()
-    fora_prazo = prazos_norm.str.startswith("fora do prazo").sum()
-
-aguardando_prog = None
-if "STATUS RESULT1" in filtrado.columns:
-    aguardando_prog = filtrado["STATUS RESULT1"].astype(str).str.lower().str.contains("programa").sum()
+# todos os cartões numa passada, sobre as flags já marcadas na carga
+ind = calcular_indicadores(filtrado, ["total", "no_prazo", "fora_prazo", "aguardando_programacao"])
 
-with kp1: kpi("Total de registros", f"{total_reg}")
-with kp2: kpi("No Prazo", f"{no_prazo}" if no_prazo is not None else None)
-with kp3: kpi("Fora do Prazo", f"{fora_prazo}" if fora_prazo is not None else None)
-with kp4: kpi("Aguardando programação", f"{aguardando_prog}" if aguardando_prog is not None else None)
+with kp1: kpi("Total de registros", f"{ind['total']}")
+with kp2: kpi("No Prazo", f"{ind['no_prazo']}" if ind["no_prazo"] is not None else None)
+with kp3: kpi("Fora do Prazo", f"{ind['fora_prazo']}" if ind["fora_prazo"] is not None else None)
+with kp4: kpi("Aguardando programação", f"{ind['aguardando_programacao']}" if ind["aguardando_programacao"] is not None else None)
 
 st.divider()
 st.subheader("Análises agregadas")
-col_a, col_b, col_c, col_d = st.columns(4)
-with col_a:
-    eixo = st.selectbox("Eixo de análise", ["MÊS", "PROJETO", "COORDENADOR"])
-with col_b:
-    ref_data_col = st.selectbox(
-        "Coluna de referência (para MÊS)",
-        options=[c for c in ["DATA_PGTO_SAP","DATA CRIAÇÃO TICKET BR","DATA CRIAÇÃO TICKET","DATA CRIAÇÃO RC"] if c in filtrado.columns] or ["(indisponível)"]
-    )
-with col_c:
-    ordenar_por = st.selectbox("Ordenar por", ["QTD_TICKETS","VALOR A PAGAR","VALOR RC","VALOR BI"])
-with col_d:
-    excluir_nulos_eixo = st.checkbox("Excluir nulos do gráfico (eixo)")
 
-try:
-    agreg = agregar(
-        filtrado,
-        eixo=eixo,
-        ref_data_col=None if eixo != "MÊS" else ref_data_col,
-        excluir_nulos_eixo=excluir_nulos_eixo
-    )
-except Exception as e:
-    st.error(f"Erro ao agregar: {e}")
-    agreg = pd.DataFrame()
+# fragmento: trocar eixo/ordenação só reexecuta esta seção; gráficos só quando visíveis
+@st.fragment
+def secao_analises(filtrado: pd.DataFrame, base: pd.DataFrame, versao_base: str, so_selecoes: bool, selecoes: dict):
+    col_a, col_b, col_c, col_d = st.columns(4)
+    with col_a:
+        eixo = st.selectbox("Eixo de análise", ["MÊS", "PROJETO", "COORDENADOR"])
+    with col_b:
+        ref_data_col = st.selectbox(
+            "Coluna de referência (para MÊS)",
+            options=[c for c in ["DATA_PGTO_SAP","DATA CRIAÇÃO TICKET BR","DATA CRIAÇÃO TICKET","DATA CRIAÇÃO RC"] if c in filtrado.columns] or ["(indisponível)"]
+        )
+    with col_c:
+        ordenar_por = st.selectbox("Ordenar por", ["QTD_TICKETS","VALOR A PAGAR","VALOR RC","VALOR BI"])
+    with col_d:
+        excluir_nulos_eixo = st.checkbox("Excluir nulos do gráfico (eixo)")
 
-if not agreg.empty and ordenar_por in agreg.columns and eixo != "MÊS":
-    agreg = agreg.sort_values(ordenar_por, ascending=False)
+    try:
+        if so_selecoes:
+            agreg = cubo_base(CAMINHO_EXCEL, aba_sel, exigir_campos, aplicar_drop_all_empty, versao_base, base).agregar(
+                eixo=eixo,
+                ref_data_col=None if eixo != "MÊS" else ref_data_col,
+                excluir_nulos_eixo=excluir_nulos_eixo,
+                selecoes=selecoes
+            )
+        else:
+            agreg = agregar(
+                filtrado,
+                eixo=eixo,
+                ref_data_col=None if eixo != "MÊS" else ref_data_col,
+                excluir_nulos_eixo=excluir_nulos_eixo
+            )
+    except Exception as e:
+        st.error(f"Erro ao agregar: {e}")
+        agreg = pd.DataFrame()
 
-agreg_fmt = formatar_moeda_df(agreg, ["VALOR RC","VALOR A PAGAR","VALOR BI"])
-st.dataframe(agreg_fmt, use_container_width=True)
+    if not agreg.empty and ordenar_por in agreg.columns and eixo != "MÊS":
+        agreg = agreg.sort_values(ordenar_por, ascending=False, kind="stable")
 
-try:
-    import plotly.express as px
-    if not agreg.empty:
-        st.plotly_chart(
-            px.bar(
-                agreg, x=agreg.columns[0], y=ordenar_por, text=ordenar_por, color=agreg.columns[0],
-                title=f"{ordenar_por} por {agreg.columns[0]}", height=400
-            ), use_container_width=True
-        )
-        st.plotly_chart(
-            px.pie(
-                agreg, names=agreg.columns[0], values="QTD_TICKETS",
-                title=f"Distribuição de tickets por {agreg.columns[0]}", hole=0.45, height=400
-            ), use_container_width=True
-        )
-except Exception as e:
-    st.warning(f"Plotly não está instalado ou houve erro ao renderizar os gráficos. Instale com: pip install plotly
+    tabela_moeda(agreg, use_container_width=True)
 
-Detalhe: {e}")
+    if agreg.empty or not st.toggle("Mostrar gráficos", value=True, key="mostrar_graficos"):
+        return
+    try:
+        fig_bar, fig_pie = figuras_agregado(assinatura_agregado(agreg), ordenar_por, "simples", agreg, montar_figuras_agregado)
+        st.plotly_chart(fig_bar, use_container_width=True)
+        st.plotly_chart(fig_pie, use_container_width=True)
+        hist = histograma_atraso(filtrado)
+        if not hist.empty:
+            st.plotly_chart(figura_atraso(assinatura_agregado(hist), "simples", hist, montar_figura_atraso), use_container_width=True)
+    except Exception as e:
+        st.warning(f"Plotly não está instalado ou houve erro ao renderizar os gráficos. Instale com: pip install plotly\n\nDetalhe: {e}")
 
-st.divider()
-st.subheader("Tabela detalhada (filtrada)")
-cols_presentes = [c for c in COLUNAS_BASE if c in filtrado.columns]
-filtrado_restrito = filtrado[cols_presentes].copy()
+# só filtros de seleção ativos: responde pelo cubo; com filtros de texto ou faixa, agrega o filtrado
+secao_analises(
+    filtrado, df, versao_base,
+    so_selecoes=not (prazo_texto or atraso_faixa or loja or pedido or busca_header or busca_livre),
+    selecoes=montar_selecoes(coord, forn, projeto, status_ticket, status_pgto, status_rc, prazo_sel, situacao_prazo),
+)
 
-for chave in ["DATA_PGTO_SAP","DATA CRIAÇÃO TICKET"]:
-    if chave in filtrado_restrito.columns:
-        filtrado_restrito = filtrado_restrito.sort_values(by=chave, ascending=True, na_position="last")
-        break
+st.divider()
+st.subheader("SLA (dias)")
+
+# prazos entre as datas já calculados na carga; aqui só os percentis do recorte filtrado
+@st.fragment
+def secao_sla(filtrado: pd.DataFrame):
+    col_a, col_b = st.columns(2)
+    with col_a:
+        dimensao = st.selectbox("Agrupar por", DIMENSOES_SLA)
+    with col_b:
+        etapa = st.selectbox("Etapa", list(ETAPAS_SLA), index=2, format_func=lambda c: ETAPAS_SLA[c][0])
+    sla = percentis_sla(filtrado, dimensao, etapa)
+    if sla.empty:
+        st.info("Sem registros com as duas datas desta etapa.")
+        return
+    st.dataframe(sla, use_container_width=True, hide_index=True)
+    st.caption("P50/P90/P99: metade, 90% e 99% dos tickets levaram até esse número de dias.")
+
+secao_sla(filtrado)
 
-filtrado_restrito_fmt = formatar_moeda_df(filtrado_restrito, ["VALOR RC","VALOR A PAGAR","VALOR BI"])
+st.divider()
+st.subheader("Tabela detalhada (filtrada)")
+cols_presentes = [c for c in [COLUNA_ANO] + COLUNAS_BASE if c in filtrado.columns]
+# ordem (DATA_PGTO_SAP / DATA CRIAÇÃO TICKET) pronta desde a carga; aqui só é restrita às linhas filtradas
+ordem_detalhe = ordem_filtrada(ordem_base_cache(CAMINHO_EXCEL, aba_sel, exigir_campos, aplicar_drop_all_empty, versao_base, df), df, filtrado)
 
-if filtrado_restrito_fmt.empty:
+if len(ordem_detalhe) == 0:
     st.warning("Nenhum registro após aplicação dos filtros. Ajuste os filtros e tente novamente.")
 else:
-    st.dataframe(filtrado_restrito_fmt, use_container_width=True)
-
-st.download_button(
-    label="Baixar resultado (CSV)",
-    data=filtrado_restrito.to_csv(index=False, sep=";", encoding="utf-8-sig"),
-    file_name=f"controle_chamados_filtrado_{datetime.now().strftime('%Y-%m-%d_%Hh%Mm')}.csv",
-    mime="text/csv"
+    c_pag1, c_pag2, c_pag3, c_pag4 = st.columns([1,1,1,3])
+    with c_pag1:
+        paginar = st.toggle("Tabela paginada", value=True, help="Envia ao navegador só a página atual.")
+    if paginar:
+        with c_pag2:
+            tamanho_pagina = st.selectbox("Linhas por página", TAMANHOS_PAGINA, index=1)
+        n_paginas = total_paginas(len(ordem_detalhe), tamanho_pagina)
+        with c_pag3:
+            # a chave muda com o resultado: filtro novo volta para a página 1
+            numero_pagina = st.number_input("Página", min_value=1, max_value=n_paginas, value=1, step=1,
+                                            key=f"pagina_detalhe_{len(ordem_detalhe)}_{tamanho_pagina}")
+        with c_pag4:
+            ini = (numero_pagina - 1) * tamanho_pagina
+            st.caption(f"Mostrando {ini + 1}–{min(ini + tamanho_pagina, len(ordem_detalhe))} de {len(ordem_detalhe)} registros · página {numero_pagina} de {n_paginas}")
+        tabela_moeda(pagina(df, ordem_detalhe, numero_pagina, tamanho_pagina, cols_presentes), use_container_width=True)
+    else:
+        tabela_moeda(df.iloc[ordem_detalhe][cols_presentes], use_container_width=True)
+
+col_fmt, col_down = st.columns([1,3])
+with col_fmt:
+    formato_export = st.selectbox("Formato do arquivo", list(FORMATOS_EXPORTACAO), index=0)
+ext_export, mime_export = FORMATOS_EXPORTACAO[formato_export]
+assinatura_export = assinatura_filtros(
+    versao=versao_base, aba=aba_sel, exigir=exigir_campos, drop=aplicar_drop_all_empty,
+    coord=coord, forn=forn, projeto=projeto, status_rc=status_rc, status_ticket=status_ticket, status_pgto=status_pgto,
+    prazo_sel=prazo_sel, prazo_texto=prazo_texto, situacao_prazo=situacao_prazo, atraso=atraso_faixa,
+    loja=loja, pedido=pedido, busca=(busca_header or busca_livre),
 )
+with col_down:
+    download_sob_demanda(
+        label=f"Baixar resultado ({formato_export})",
+        gerar=lambda: exportar_filtrado(assinatura_export, formato_export, df.iloc[ordem_detalhe][cols_presentes]),
+        file_name=f"controle_chamados_filtrado_{datetime.now().strftime('%Y-%m-%d_%Hh%Mm')}.{ext_export}",
+        mime=mime_export,
+        key="download_filtrado",
+    )
 
-col_a1, col_a2 = st.columns([1,3])
-with col_a1:
-    if st.button("Atualizar"):
-        st.cache_data.clear()
-        safe_rerun()
-with col_a2:
-    st.caption("Após substituir a planilha no GitHub, clique em **Atualizar cache** para recarregar os dados.")
+st.caption("Após substituir a planilha no GitHub, os dados são recarregados automaticamente na próxima interação.")
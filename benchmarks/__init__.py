@@ -0,0 +1 @@
+# benchmarks — medições headless da camada de dados (controle_chamados)
@@ -0,0 +1,203 @@
+# benchmarks/bench.py — mede a camada de dados sem a UI do Streamlit e grava resultados em JSON
+#   python -m benchmarks.bench --linhas 10000 100000 --formato xlsx
+#   python -m benchmarks.bench --linhas 10000 --comparar benchmarks/resultados/<anterior>.json
+import argparse, json, multiprocessing, os, platform, shutil, statistics, subprocess, sys, tempfile, time
+from datetime import datetime
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+PASTA_DADOS = os.path.join(PASTA, ".dados")
+PASTA_RESULTADOS = os.path.join(PASTA, "resultados")
+
+# snapshots do benchmark numa pasta temporária própria, nunca no cache do app, mesmo que CONTROLE_CHAMADOS_CACHE
+# esteja exportada (precisa vir antes de importar o pacote); os processos filhos (spawn) herdam a mesma pasta
+if "CONTROLE_CHAMADOS_BENCH_CACHE" not in os.environ:
+    os.environ["CONTROLE_CHAMADOS_BENCH_CACHE"] = tempfile.mkdtemp(prefix="controle_chamados_bench_")
+PASTA_CACHE = os.environ["CONTROLE_CHAMADOS_CACHE"] = os.environ["CONTROLE_CHAMADOS_BENCH_CACHE"]
+
+import pandas as pd
+
+from controle_chamados.busca import IndiceBusca
+from controle_chamados.consulta import FILTROS_VAZIOS, agregar, aplicar_filtros
+from controle_chamados.cubo import CuboAgregacao
+from controle_chamados.exportacao import exportar
+from controle_chamados.filtros import MotorFiltros
+from controle_chamados.ingestao import ler_planilha
+from controle_chamados.moeda import COLUNAS_VALOR, formatar_moeda_df
+from controle_chamados.saneamento import EXIGIR_PADRAO, ler_base
+from controle_chamados.sla import DIMENSOES_SLA, percentis_sla
+
+from .gerar_planilha import ABA_SINTETICA, planilha_sintetica
+
+
+def cronometrar(fn, repeticoes: int):
+    tempos, resultado = [], None
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        resultado = fn()
+        tempos.append(time.perf_counter() - t0)
+    return tempos, resultado
+
+
+def _ingestao_isolada(caminho: str, aba: str, streaming: bool, fila) -> None:
+    # roda num processo novo: o pico de RSS (ru_maxrss) é só desta leitura + o interpretador
+    try:
+        import resource
+        rss = lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB -> MB (Linux)
+    except ImportError:  # Windows: sem resource, mede só o tempo
+        rss = lambda: None
+    antes = rss()
+    t0 = time.perf_counter()
+    df = ler_planilha(caminho, aba, streaming=streaming)
+    fila.put((time.perf_counter() - t0, antes, rss(), len(df), len(df.columns)))
+
+
+def medir_ingestao(caminho: str, aba: str, repeticoes: int) -> dict:
+    # leitura atual (openpyxl read-only em fluxo, colunas do schema) x anterior (pd.read_excel com tudo)
+    ctx = multiprocessing.get_context("spawn")
+    medidas = {}
+    for nome, streaming in (("ingestao/read_excel", False), ("ingestao/streaming", True)):
+        execucoes = []
+        for _ in range(repeticoes):
+            fila = ctx.Queue()
+            proc = ctx.Process(target=_ingestao_isolada, args=(caminho, aba, streaming, fila))
+            proc.start()
+            execucoes.append(fila.get())
+            proc.join()
+        medidas[nome] = execucoes
+    return medidas
+
+
+def casos_filtro(df: pd.DataFrame) -> dict:
+    # um valor real de cada coluna para cada tipo de filtro
+    def primeiro(col):
+        v = df[col].dropna()
+        return [v.iloc[0]] if len(v) else []
+    return {
+        "coordenador": {"coord_sel": primeiro("COORDENADOR")},
+        "fornecedor": {"forn_sel": primeiro("FORNECEDOR")},
+        "projeto": {"projeto_sel": primeiro("PROJETO")},
+        "status_rc": {"status_rc_sel": primeiro("STATUS RC")},
+        "status_ticket": {"status_ticket_sel": primeiro("CHAMADO")},
+        "status_pgto": {"status_pgto_sel": primeiro("STATUS RESULT1")},
+        "prazo": {"prazo_sel": ["no prazo"]},
+        "prazo_texto": {"prazo_texto": "dias"},
+        "situacao_prazo": {"situacao_prazo_sel": ["FORA DO PRAZO"]},
+        "atraso_10_dias": {"atraso_faixa": (11, None)},
+        "loja": {"loja_texto": "14"},
+        "pedido": {"pedido_texto": "45000"},
+        "busca_livre": {"busca_texto": "henrique"},
+        "combinado": {"coord_sel": primeiro("COORDENADOR"), "status_ticket_sel": ["ABERTO"], "busca_texto": "ltda"},
+    }
+
+
+def medir(linhas: int, formato: str, repeticoes: int) -> list:
+    caminho = planilha_sintetica(linhas, PASTA_DADOS, formato)
+    resultados = []
+
+    def registrar(operacao, tempos, linhas_resultado=None, **extra):
+        resultados.append({
+            "linhas": linhas, "operacao": operacao, "repeticoes": len(tempos),
+            "segundos_min": min(tempos), "segundos_mediana": statistics.median(tempos),
+            "linhas_resultado": linhas_resultado, **extra,
+        })
+        detalhe = "".join(f"  {k}={v}" for k, v in extra.items())
+        print(f"  {linhas:>9} {operacao:<38} {min(tempos):9.4f}s{detalhe}", flush=True)
+
+    # ingestão bruta, cada execução num processo próprio para medir o pico de memória
+    for operacao, execucoes in medir_ingestao(caminho, ABA_SINTETICA, repeticoes).items():
+        tempos = [e[0] for e in execucoes]
+        picos = [e[2] - e[1] for e in execucoes if e[2] is not None]
+        registrar(operacao, tempos, execucoes[0][3], colunas=execucoes[0][4],
+                  pico_rss_mb=round(max(picos), 1) if picos else None)
+
+    # carregar_base: frio (planilha + saneamento) e quente (snapshot Parquet)
+    shutil.rmtree(PASTA_CACHE, ignore_errors=True)
+    tempos, df = cronometrar(lambda: ler_base(caminho, ABA_SINTETICA, EXIGIR_PADRAO, True), 1)
+    registrar("carregar_base/planilha", tempos, len(df))
+    tempos, df = cronometrar(lambda: ler_base(caminho, ABA_SINTETICA, EXIGIR_PADRAO, True), repeticoes)
+    registrar("carregar_base/snapshot", tempos, len(df))
+
+    tempos, motor = cronometrar(lambda: MotorFiltros(df), 1)
+    registrar("motor_filtros/construcao", tempos)
+    tempos, indice = cronometrar(lambda: IndiceBusca(df), 1)
+    registrar("indice_busca/construcao", tempos)
+
+    for nome, filtros in casos_filtro(df).items():
+        args = {**FILTROS_VAZIOS, **filtros}
+        tempos, f = cronometrar(lambda: aplicar_filtros(df, **args, indice_busca=indice, motor=motor), repeticoes)
+        registrar(f"aplicar_filtros/{nome}", tempos, len(f))
+        if not args["busca_texto"]:
+            tempos, f = cronometrar(lambda: aplicar_filtros(df, **args), repeticoes)
+            registrar(f"aplicar_filtros_mascara/{nome}", tempos, len(f))
+
+    for eixo in ["MÊS", "PROJETO", "COORDENADOR"]:
+        tempos, a = cronometrar(lambda: agregar(df, eixo, "DATA CRIAÇÃO TICKET BR", True), repeticoes)
+        registrar(f"agregar/{eixo}", tempos, len(a))
+        # cubo novo a cada repetição: mede construção + consulta, sem o memo
+        tempos, a = cronometrar(lambda: CuboAgregacao(df).agregar(eixo, "DATA CRIAÇÃO TICKET BR", True), repeticoes)
+        registrar(f"cubo_frio/{eixo}", tempos, len(a))
+
+    for dimensao in DIMENSOES_SLA:
+        tempos, a = cronometrar(lambda: percentis_sla(df, dimensao, "_DIAS_TICKET_PGTO"), repeticoes)
+        registrar(f"sla_percentis/{dimensao}", tempos, len(a))
+
+    tempos, _ = cronometrar(lambda: formatar_moeda_df(df, COLUNAS_VALOR), repeticoes)
+    registrar("formatar_moeda_df", tempos, len(df))
+    tempos, dados = cronometrar(lambda: exportar(df, "CSV"), repeticoes)
+    registrar("exportar/CSV", tempos, len(df))
+    return resultados
+
+
+def commit_atual() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=PASTA, check=True).stdout.strip()
+    except Exception:
+        return "desconhecido"
+
+
+def comparar(atual: list, caminho_anterior: str) -> None:
+    with open(caminho_anterior, encoding="utf-8") as fh:
+        anterior = {(r["linhas"], r["operacao"]): r for r in json.load(fh)["resultados"]}
+    print(f"\nComparação com {caminho_anterior} (razão = atual / anterior, segundos_min):")
+    for r in atual:
+        base = anterior.get((r["linhas"], r["operacao"]))
+        if base and base["segundos_min"] > 0:
+            razao = r["segundos_min"] / base["segundos_min"]
+            alerta = "  <-- regressão" if razao > 1.2 else ""
+            print(f"  {r['linhas']:>9} {r['operacao']:<32} {razao:6.2f}x{alerta}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark headless da camada de dados.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--formato", choices=["xlsx", "csv"], default="xlsx",
+                        help="csv gera/lê mais rápido (útil para 1M de linhas); xlsx mede o openpyxl de verdade")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--saida", default=None, help="arquivo JSON (padrão: benchmarks/resultados/<data>_<commit>.json)")
+    parser.add_argument("--comparar", default=None, help="JSON de uma execução anterior")
+    args = parser.parse_args(argv)
+
+    resultados = []
+    try:
+        for linhas in args.linhas:
+            print(f"[{linhas} linhas]", flush=True)
+            resultados += medir(linhas, args.formato, args.repeticoes)
+    finally:
+        shutil.rmtree(PASTA_CACHE, ignore_errors=True)
+
+    commit = commit_atual()
+    saida = args.saida or os.path.join(PASTA_RESULTADOS, f"{datetime.now():%Y%m%d_%H%M%S}_{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as fh:
+        json.dump({
+            "commit": commit, "data": datetime.now().isoformat(timespec="seconds"), "formato": args.formato,
+            "python": sys.version.split()[0], "pandas": pd.__version__, "plataforma": platform.platform(),
+            "resultados": resultados,
+        }, fh, ensure_ascii=False, indent=2)
+    print(f"\nResultados: {saida}")
+    if args.comparar:
+        comparar(resultados, args.comparar)
+
+
+if __name__ == "__main__":
+    main()
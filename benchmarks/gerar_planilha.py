@@ -0,0 +1,119 @@
+# benchmarks/gerar_planilha.py — planilha sintética com o schema de COLUNAS_BASE (dados fictícios)
+import argparse, os
+
+import numpy as np
+import pandas as pd
+
+from controle_chamados.esquema import COLUNAS_BASE
+
+ABA_SINTETICA = "SOLICITAÇÃO DE PAGAMENTO"
+
+COORDENADORES = ["Henrique", "Marina Lopes", "Carlos", "Patricia Nunes", "Rafael", "Juliana", "Tiago", "Bruna Alves"]
+FORNECEDORES = [f"Fornecedor {i:03d} Ltda" for i in range(120)]
+PROJETOS = ["REFORMA", "Manutenção", "Loja Nova", "Climatização", "Comunicação Visual", "Elétrica", "Hidráulica", "Fachada"]
+SERVICOS = ["REFORMA", "Gerenciadora", "Construtora", "COMUNICAÇÃO VISUAL", "Utilities"]
+STATUS_RC = ["Pedido Criado", "Orçamento Recebido", "Requisição Feita", "Aguardando Pedido"]
+CHAMADOS = ["ABERTO", "PENDENTE"]
+STATUS_PGTO = ["Aguardando nota", "Chamado aberto, aguardando programação de pagamento", "Data de pagamento: 30/12/2025", "Data de pagamento: 01/12/2025"]
+
+
+def _variar_caixa(valores: np.ndarray, rng) -> np.ndarray:
+    # mesma categoria escrita de jeitos diferentes ("Henrique", "HENRIQUE ", "henrique")
+    sorteio = rng.integers(0, 4, len(valores))
+    return np.select(
+        [sorteio == 0, sorteio == 1, sorteio == 2],
+        [np.char.upper(valores.astype(str)), np.char.lower(valores.astype(str)), np.char.add(valores.astype(str), "  ")],
+        valores,
+    )
+
+
+def _moeda_suja(valores: np.ndarray, rng) -> np.ndarray:
+    # mistura número puro, "R$ 1.234,56", "1234,56", "1.234" e brancos, como na planilha real
+    br = np.array([f"{v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for v in valores], dtype=object)
+    sorteio = rng.integers(0, 6, len(valores))
+    saida = np.where(sorteio == 0, valores.astype(object), br)
+    saida = np.where(sorteio == 1, "R$ " + br, saida)
+    saida = np.where(sorteio == 2, np.char.replace(br.astype(str), ".", "").astype(object), saida)
+    saida = np.where(sorteio == 3, np.round(valores).astype(np.int64).astype(object), saida)
+    saida = np.where(sorteio == 4, "\xa0", saida)
+    return saida
+
+
+def gerar_base(linhas: int, semente: int = 42, fracao_lixo: float = 0.3) -> pd.DataFrame:
+    rng = np.random.default_rng(semente)
+    n = linhas
+    inicio = np.datetime64("2025-01-01")
+    dias_ticket = rng.integers(0, 365, n)
+    data_ticket = inicio + dias_ticket.astype("timedelta64[D]")
+    data_pgto = data_ticket + rng.integers(5, 60, n).astype("timedelta64[D]")
+    atraso = rng.integers(1, 30, n)
+    prazo = np.select(
+        [rng.random(n) < 0.8, rng.random(n) < 0.5],
+        ["pagamento efetivado", "no prazo"],
+        np.char.add(np.char.add("fora do prazo (", atraso.astype(str)), " dias)"),
+    ).astype(object)
+    valor = np.round(rng.lognormal(9, 1.2, n), 2)
+
+    df = pd.DataFrame({
+        "EMP": rng.choice([1000, 2000], n),
+        "FILIAL": rng.integers(1000, 1600, n),
+        "LOJA": np.char.add("LJ", rng.integers(1, 1600, n).astype(str)),
+        "CNPJ": np.char.add("00.000.000/", np.char.zfill(rng.integers(1, 9999, n).astype(str), 4)),
+        "COORDENADOR": _variar_caixa(rng.choice(COORDENADORES, n), rng),
+        "PROJETO": _variar_caixa(rng.choice(PROJETOS, n), rng),
+        "SERVIÇO": rng.choice(SERVICOS, n),
+        "NOTA": rng.integers(1, 5000, n),
+        "FORNECEDOR": _variar_caixa(rng.choice(FORNECEDORES, n), rng),
+        "VALOR RC": _moeda_suja(valor, rng),
+        "VALOR A PAGAR": _moeda_suja(valor * rng.uniform(0.5, 1, n), rng),
+        "VALOR BI": _moeda_suja(valor, rng),
+        "STATUS RC": rng.choice(STATUS_RC, n),
+        "PEDIDO": 4500000000 + rng.integers(0, 999999, n),
+        "CHAMADO": rng.choice(CHAMADOS, n, p=[0.95, 0.05]),
+        "DATA_PGTO_SAP": pd.to_datetime(data_pgto),
+        "MIRO": 5100000000 + rng.integers(0, 999999, n),
+        "STATUS RESULT1": rng.choice(STATUS_PGTO, n),
+        "DATA CRIAÇÃO TICKET": pd.to_datetime(data_ticket),
+        "PRAZO": prazo,
+        "DATA CRIAÇÃO TICKET BR": pd.Series(pd.to_datetime(data_ticket)).dt.strftime("%d/%m/%Y"),
+        "DATA CRIAÇÃO RC": pd.to_datetime(data_ticket - rng.integers(1, 20, n).astype("timedelta64[D]")),
+    })[COLUNAS_BASE]
+
+    # linhas lixo: só formatação/fórmula, nenhum campo-chave preenchido
+    lixo = rng.random(n) < fracao_lixo
+    df = df.astype(object)
+    df.loc[lixo, :] = None
+    return df
+
+
+def gravar_planilha(df: pd.DataFrame, caminho: str) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    if caminho.lower().endswith(".csv"):
+        df.to_csv(caminho, sep=";", index=False, encoding="utf-8")
+        return caminho
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(ABA_SINTETICA)
+    ws.append(list(df.columns))
+    for linha in df.itertuples(index=False, name=None):
+        ws.append([None if v is None or (isinstance(v, float) and np.isnan(v)) else v for v in linha])
+    wb.save(caminho)
+    return caminho
+
+
+def planilha_sintetica(linhas: int, pasta: str, formato: str = "xlsx", semente: int = 42) -> str:
+    # gerada uma vez por (linhas, semente, formato) e reaproveitada entre execuções
+    caminho = os.path.join(pasta, f"sintetica_{linhas}_{semente}.{formato}")
+    if not os.path.exists(caminho):
+        gravar_planilha(gerar_base(linhas, semente), caminho)
+    return caminho
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera planilha sintética de SOLICITAÇÃO DE PAGAMENTO.")
+    parser.add_argument("linhas", type=int)
+    parser.add_argument("saida")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+    print(gravar_planilha(gerar_base(args.linhas, args.semente), args.saida))
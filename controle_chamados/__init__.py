@@ -0,0 +1 @@
+# controle_chamados — camada de dados compartilhada pelos apps Streamlit
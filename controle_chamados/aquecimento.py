@@ -0,0 +1,54 @@
+# controle_chamados/aquecimento.py — preparo da base em segundo plano ao subir o processo
+import importlib, threading, time
+from concurrent.futures import Future
+
+
+class Aquecimento:
+    # executa as etapas (descrição, fn(contexto)) em ordem numa thread daemon;
+    # a UI só lê etapa/progresso e não espera o fim
+
+    def __init__(self, etapas: list):
+        self.etapas = list(etapas)
+        self.etapa = ""
+        self.concluidas = 0
+        self.erro = None
+        self.duracao = None
+        self.pronto = threading.Event()
+        self._thread = threading.Thread(target=self._rodar, name="aquecimento-base", daemon=True)
+
+    def iniciar(self) -> "Aquecimento":
+        self._thread.start()
+        return self
+
+    @property
+    def progresso(self) -> float:
+        return self.concluidas / max(1, len(self.etapas))
+
+    def _rodar(self) -> None:
+        contexto = {}
+        t0 = time.perf_counter()
+        try:
+            for descricao, fn in self.etapas:
+                self.etapa = descricao
+                fn(contexto)
+                self.concluidas += 1
+        except Exception as e:
+            # o caminho normal da UI refaz a etapa e mostra o erro ao usuário
+            self.erro = e
+        finally:
+            self.duracao = time.perf_counter() - t0
+            self.pronto.set()
+
+
+def importar_em_segundo_plano(modulo: str) -> Future:
+    # import pesado (ex.: plotly.express) numa thread daemon; .result() devolve o módulo quando precisar dele
+    futuro = Future()
+
+    def rodar():
+        try:
+            futuro.set_result(importlib.import_module(modulo))
+        except BaseException as e:
+            futuro.set_exception(e)
+
+    threading.Thread(target=rodar, name=f"import-{modulo}", daemon=True).start()
+    return futuro
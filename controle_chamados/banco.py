@@ -0,0 +1,183 @@
+# controle_chamados/banco.py — base saneada num arquivo SQLite indexado; filtros e agregações viram SQL parametrizado
+# (para bases grandes: a consulta devolve só as linhas/grupos pedidos, sem a base inteira em memória por processo)
+import functools, json, re, sqlite3
+
+import numpy as np
+import pandas as pd
+
+from .busca import normalizar_texto, textos_linhas
+from .consulta import FILTROS_VAZIOS, ordenar_grupos
+from .esquema import COLUNAS_DATA
+from .filtros import ARGS_FAIXA, ARGS_SELECAO, ARGS_TEXTO, RE_METACARACTERES, validar_regex
+from .moeda import COLUNAS_VALOR
+from .paginacao import COLUNAS_ORDEM
+from .prazo import COL_DIAS_ATRASO, COL_SITUACAO_PRAZO
+from .sla import coluna_mes, rotulo_mes
+
+# Incrementar quando o formato da tabela mudar, para recarregar bancos antigos
+VERSAO_BANCO = 1
+
+COL_POSICAO = "_POS"  # posição da linha na base (mesma ordem do DataFrame)
+COL_TEXTO_BUSCA = "_TEXTO_BUSCA"  # texto normalizado da linha, o mesmo do IndiceBusca
+COLUNAS_INDICE = ["COORDENADOR", "FORNECEDOR", "PROJETO", "LOJA", "PEDIDO"] + COLUNAS_DATA + [COL_SITUACAO_PRAZO, COL_DIAS_ATRASO]
+EIXOS_SQL = ["MÊS", "PROJETO", "COORDENADOR"]
+
+
+def _q(coluna: str) -> str:
+    # nomes de coluna vêm das constantes do esquema (nunca do usuário); valores vão sempre como parâmetro
+    return '"' + str(coluna).replace('"', '""') + '"'
+
+
+@functools.lru_cache(maxsize=256)
+def _regex(padrao: str):
+    return re.compile(padrao, re.IGNORECASE)
+
+
+def _regexp(padrao, valor) -> bool:
+    # X REGEXP Y do SQLite: mesma regra do str.contains(case=False) do pandas
+    return valor is not None and _regex(padrao).search(str(valor)) is not None
+
+
+class BaseSQL:
+    # tabela "base" (uma linha por linha da base saneada) + tabela "meta" com a identificação da carga
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.con = sqlite3.connect(caminho)
+        self.con.create_function("REGEXP", 2, _regexp, deterministic=True)
+        self.con.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT)")
+
+    def fechar(self) -> None:
+        self.con.close()
+
+    def identificacao(self):
+        linha = self.con.execute("SELECT valor FROM meta WHERE chave = 'identificacao'").fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def atualizado(self, identificacao: dict) -> bool:
+        return self.identificacao() == {**identificacao, "formato": VERSAO_BANCO}
+
+    def carregar(self, df: pd.DataFrame, identificacao: dict, tamanho_bloco: int = 50_000) -> None:
+        # recria a tabela numa transação só; identificacao (versão da planilha, aba, saneamento) decide se recarrega
+        tabela = df.assign(**{COL_POSICAO: np.arange(len(df), dtype=np.int64), COL_TEXTO_BUSCA: textos_linhas(df)})
+        with self.con:
+            self.con.execute("DROP TABLE IF EXISTS base")
+            self.con.execute(pd.io.sql.get_schema(tabela, "base", keys=COL_POSICAO, con=self.con))
+            tabela.to_sql("base", self.con, if_exists="append", index=False, chunksize=tamanho_bloco)
+            for i, c in enumerate(c for c in COLUNAS_INDICE if c in tabela.columns):
+                self.con.execute(f"CREATE INDEX ix_base_{i} ON base ({_q(c)})")
+            # tipos da base inteira: num recorte o esquema inferiria outro (ex.: NOTA só com números vira Int32)
+            tipos = {c: str(t) for c, t in df.dtypes.items()}
+            identificacao = json.dumps({**identificacao, "formato": VERSAO_BANCO}, ensure_ascii=False, sort_keys=True, default=str)
+            self.con.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                 [("identificacao", identificacao), ("tipos", json.dumps(tipos, ensure_ascii=False))])
+        self.con.execute("ANALYZE")
+        self.__dict__.pop("colunas", None)
+        self.__dict__.pop("tipos", None)
+
+    @functools.cached_property
+    def colunas(self) -> list:
+        return [linha[1] for linha in self.con.execute("PRAGMA table_info(base)")]
+
+    @functools.cached_property
+    def tipos(self) -> dict:
+        linha = self.con.execute("SELECT valor FROM meta WHERE chave = 'tipos'").fetchone()
+        return json.loads(linha[0]) if linha else {}
+
+    def _restaurar_tipos(self, df: pd.DataFrame) -> pd.DataFrame:
+        novas = {}
+        for c, tipo in self.tipos.items():
+            if c not in df.columns:
+                continue
+            if tipo.startswith("datetime64"):
+                novas[c] = pd.to_datetime(df[c]).astype(tipo)
+            elif tipo == "bool":
+                novas[c] = df[c].astype(bool)
+            else:
+                novas[c] = df[c].astype(tipo)
+        return df.assign(**novas) if novas else df
+
+    def total_linhas(self) -> int:
+        return self.con.execute("SELECT COUNT(*) FROM base").fetchone()[0]
+
+    def valores(self, coluna: str) -> list:
+        return [v for (v,) in self.con.execute(f"SELECT DISTINCT {_q(coluna)} FROM base WHERE {_q(coluna)} IS NOT NULL ORDER BY 1")]
+
+    def _condicoes(self, filtros: dict) -> tuple:
+        # mesmos critérios de aplicar_filtros: IN para seleções, faixa numérica, contém texto e busca livre
+        filtros = {**FILTROS_VAZIOS, **filtros}
+        partes, params = [], []
+        for arg, col in ARGS_SELECAO.items():
+            valores = list(filtros[arg] or [])
+            if valores and col in self.colunas:
+                partes.append(f"{_q(col)} IN ({', '.join('?' * len(valores))})")
+                params += [str(v) for v in valores]
+        for arg, col in ARGS_FAIXA.items():
+            if filtros[arg] and col in self.colunas:
+                minimo, maximo = filtros[arg]
+                partes.append(f"{_q(col)} IS NOT NULL")
+                if minimo is not None:
+                    partes.append(f"{_q(col)} >= ?")
+                    params.append(minimo)
+                if maximo is not None:
+                    partes.append(f"{_q(col)} <= ?")
+                    params.append(maximo)
+        for arg, col in ARGS_TEXTO.items():
+            texto = filtros[arg]
+            if texto and col in self.colunas:
+                if RE_METACARACTERES.search(texto) or not texto.isascii():
+                    # antes da consulta: senão o erro vira um sqlite3.OperationalError genérico, de dentro da REGEXP
+                    validar_regex(col, texto)
+                    partes.append(f"{_q(col)} REGEXP ?")
+                    params.append(texto)
+                else:
+                    # trecho literal ASCII: LIKE já ignora maiúsculas/minúsculas
+                    partes.append(f"{_q(col)} LIKE ? ESCAPE '\\'")
+                    params.append("%" + re.sub(r"([\\%_])", r"\\\1", texto) + "%")
+        busca = normalizar_texto(filtros["busca_texto"] or "").strip()
+        if busca:
+            partes.append(f"instr({_q(COL_TEXTO_BUSCA)}, ?) > 0")
+            params.append(busca)
+        return (" WHERE " + " AND ".join(partes) if partes else ""), params
+
+    def filtrar(self, filtros: dict, colunas: list = None, ordenar: bool = True) -> pd.DataFrame:
+        # linhas filtradas, com os tipos da base; ordenar = mesma ordem da tabela detalhada
+        cols = [c for c in (colunas or self.colunas) if c in self.colunas and c not in (COL_POSICAO, COL_TEXTO_BUSCA)]
+        where, params = self._condicoes(filtros)
+        ordem = _q(COL_POSICAO)
+        data = next((c for c in COLUNAS_ORDEM if c in self.colunas), None)
+        if ordenar and data:
+            ordem = f"({_q(data)} IS NULL), {_q(data)}, {_q(COL_POSICAO)}"
+        sql = f"SELECT {', '.join(map(_q, cols))} FROM base{where} ORDER BY {ordem}"
+        return self._restaurar_tipos(pd.read_sql_query(sql, self.con, params=params))
+
+    def agregar(self, filtros: dict, eixo: str, ref_data_col: str = None, excluir_nulos_eixo: bool = False) -> pd.DataFrame:
+        # mesmo resultado de consulta.agregar sobre aplicar_filtros(...), com GROUP BY no banco
+        # (somas iguais a menos do arredondamento do float: o SQLite soma em outra ordem)
+        if eixo not in EIXOS_SQL:
+            raise ValueError("Eixo inválido. Use 'MÊS', 'PROJETO' ou 'COORDENADOR'.")
+        if eixo == "MÊS":
+            if coluna_mes(ref_data_col or "") not in self.colunas:
+                raise ValueError("A coluna de data '{}' não existe.".format(ref_data_col))
+            grupo = _q(coluna_mes(ref_data_col))
+            nulos = f"{grupo} >= 0"
+        else:
+            if eixo not in self.colunas:
+                raise ValueError(f"Coluna '{eixo}' não encontrada.")
+            grupo = _q(eixo)
+            nulos = f"{grupo} IS NOT NULL AND trim({grupo}) <> ''"
+        where, params = self._condicoes(filtros)
+        if excluir_nulos_eixo:
+            where = (where + " AND " if where else " WHERE ") + nulos
+        # VALOR ausente na base: "size", como no agregar original
+        somas = [f"SUM(COALESCE({_q(c)}, 0))" if c in self.colunas else "COUNT(*)" for c in COLUNAS_VALOR]
+        # MÊS em ordem cronológica, sem data (código -1) por último; os outros eixos saem de ordenar_grupos
+        ordem = f"({grupo} < 0), {grupo}" if eixo == "MÊS" else f"({grupo} IS NULL), {grupo}"
+        sql = f"SELECT {grupo}, {', '.join(somas)}, COUNT(*) FROM base{where} GROUP BY {grupo} ORDER BY {ordem}"
+        agreg = pd.DataFrame(self.con.execute(sql, params).fetchall(), columns=[eixo] + COLUNAS_VALOR + ["QTD_TICKETS"])
+        agreg = agreg.astype({c: "float64" for c in COLUNAS_VALOR if c in self.colunas})
+        if eixo == "MÊS":
+            agreg[eixo] = [rotulo_mes(c) for c in agreg[eixo]]
+            return agreg
+        # mesma ordenação do agregar e do cubo
+        return ordenar_grupos(agreg, eixo)
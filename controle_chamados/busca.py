@@ -0,0 +1,105 @@
+# controle_chamados/busca.py — índice invertido para a busca livre / busca rápida
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+TAM_NGRAMA = 3
+
+
+def normalizar_texto(s: str) -> str:
+    # minúsculas + sem acento: "JOÃO" e "joao" caem no mesmo token
+    s = unicodedata.normalize("NFKD", str(s))
+    return "".join(ch for ch in s if not unicodedata.combining(ch)).lower()
+
+
+def _texto_coluna(serie: pd.Series) -> pd.Series:
+    # normaliza cada valor distinto uma vez só (colunas categóricas repetem muito)
+    valores = serie.dropna().astype(str)
+    mapa = {v: normalizar_texto(v) for v in valores.unique()}
+    return valores.map(mapa).astype(object).reindex(serie.index, fill_value="")
+
+
+def textos_linhas(df: pd.DataFrame, colunas: list = None) -> np.ndarray:
+    # texto normalizado de cada linha (colunas "_" derivadas ficam de fora): é nele que a busca livre procura
+    cols = colunas or [c for c in df.columns if not str(c).startswith("_")]
+    colunas_txt = [_texto_coluna(df[c]).to_numpy() for c in cols]
+    return np.asarray([" ".join(filter(None, linha)) for linha in zip(*colunas_txt)], dtype=object)
+
+
+def _ngramas(token: str) -> set:
+    return {token[i:i + TAM_NGRAMA] for i in range(len(token) - TAM_NGRAMA + 1)}
+
+
+class IndiceBusca:
+    # token -> posições das linhas (listas ordenadas) + n-gramas -> tokens do vocabulário
+
+    def __init__(self, df: pd.DataFrame, colunas: list = None):
+        self.rotulos = df.index
+        self.n_linhas = len(df)
+        self.textos = textos_linhas(df, colunas)
+
+        # pares (token, linha) sem repetição, agrupados por token e com linhas em ordem
+        tokens_linha = [set(t.split()) for t in self.textos]
+        qtd = np.fromiter((len(t) for t in tokens_linha), dtype=np.int64, count=self.n_linhas)
+        codigos, vocab = pd.factorize(pd.Series([tok for t in tokens_linha for tok in t], dtype=object))
+        linhas = np.repeat(np.arange(self.n_linhas, dtype=np.int32), qtd)
+        ordem = np.argsort(codigos, kind="stable")
+        self.vocab = np.asarray(vocab, dtype=object)
+        self.posicoes = linhas[ordem]
+        self.inicio = np.searchsorted(codigos[ordem], np.arange(len(self.vocab) + 1))
+
+        self.ngramas = {}
+        for i, tok in enumerate(self.vocab):
+            for g in _ngramas(tok):
+                self.ngramas.setdefault(g, []).append(i)
+        self.ngramas = {g: np.asarray(ids, dtype=np.int32) for g, ids in self.ngramas.items()}
+
+    def _tokens_contendo(self, termo: str) -> np.ndarray:
+        if len(termo) >= TAM_NGRAMA:
+            cand = None
+            for g in _ngramas(termo):
+                ids = self.ngramas.get(g)
+                if ids is None:
+                    return np.empty(0, dtype=np.int32)
+                cand = ids if cand is None else np.intersect1d(cand, ids, assume_unique=True)
+            return np.asarray([i for i in cand if termo in self.vocab[i]], dtype=np.int32)
+        # termo curto: varre só o vocabulário (bem menor que a base)
+        achou = pd.Series(self.vocab, dtype=object).str.contains(termo, regex=False).to_numpy(dtype=bool)
+        return np.flatnonzero(achou).astype(np.int32)
+
+    def _linhas_do_termo(self, termo: str) -> np.ndarray:
+        ids = self._tokens_contendo(termo)
+        if len(ids) == 0:
+            return np.empty(0, dtype=np.int32)
+        marca = np.zeros(self.n_linhas, dtype=bool)
+        for i in ids:
+            marca[self.posicoes[self.inicio[i]:self.inicio[i + 1]]] = True
+        return np.flatnonzero(marca)
+
+    def buscar(self, consulta: str) -> np.ndarray:
+        q = normalizar_texto(consulta)
+        termos = q.split()
+        if not termos:
+            return np.arange(self.n_linhas)
+        pos = None
+        for termo in sorted(set(termos), key=len, reverse=True):
+            linhas = self._linhas_do_termo(termo)
+            pos = linhas if pos is None else np.intersect1d(pos, linhas, assume_unique=True)
+            if len(pos) == 0:
+                return pos
+        if len(termos) > 1:
+            # vários termos: confere a frase inteira só nas candidatas
+            pos = pos[[q.strip() in self.textos[i] for i in pos]]
+        return pos
+
+    def buscar_em(self, consulta: str, candidatas: np.ndarray) -> np.ndarray:
+        # mesma regra de buscar() (o texto da linha contém a consulta), conferida só nas candidatas
+        q = normalizar_texto(consulta).strip()
+        if not q:
+            return candidatas
+        return candidatas[np.fromiter((q in self.textos[i] for i in candidatas), dtype=bool, count=len(candidatas))]
+
+    def filtrar(self, df: pd.DataFrame, consulta: str) -> pd.DataFrame:
+        rotulos = self.rotulos[self.buscar(consulta)]
+        return df[df.index.isin(rotulos)]
@@ -0,0 +1,140 @@
+# controle_chamados/consulta.py — filtros e agregações sobre a base saneada
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from .filtros import interseccao, montar_selecoes, validar_regex
+from .moeda import COLUNAS_VALOR, converter_moeda_serie
+from .prazo import COL_DIAS_ATRASO, COL_SITUACAO_PRAZO
+from .sla import codigo_mes, coluna_mes, rotulo_mes
+
+# todos os filtros desligados (argumentos nomeados de aplicar_filtros)
+FILTROS_VAZIOS = dict(coord_sel=[], forn_sel=[], projeto_sel=[], status_ticket_sel=[], status_pgto_sel=[], status_rc_sel=[],
+                      prazo_sel=[], prazo_texto="", loja_texto="", pedido_texto="", busca_texto="", situacao_prazo_sel=[],
+                      atraso_faixa=None)
+
+
+def aplicar_filtros(df: pd.DataFrame, coord_sel, forn_sel, projeto_sel, status_ticket_sel, status_pgto_sel,
+                    status_rc_sel, prazo_sel, prazo_texto, loja_texto, pedido_texto, busca_texto, situacao_prazo_sel=None,
+                    atraso_faixa=None, indice_busca=None, motor=None, memo=None, versao=None):
+    # situacao_prazo_sel: situações de PRAZO (NO PRAZO, FORA DO PRAZO, ...); atraso_faixa: (mín, máx) dias de atraso
+    # regex inválida num filtro de texto: ValueError com o nome do filtro, igual em todos os caminhos
+    for coluna, texto in (("PRAZO", prazo_texto), ("LOJA", loja_texto), ("PEDIDO", pedido_texto)):
+        validar_regex(coluna, texto)
+    if motor is not None and memo is not None and (indice_busca is not None or not busca_texto):
+        # resultado guardado na sessão (ou refinado a partir de um) em vez de refazer tudo a cada rerun
+        filtros = dict(coord_sel=coord_sel, forn_sel=forn_sel, projeto_sel=projeto_sel, status_ticket_sel=status_ticket_sel,
+                       status_pgto_sel=status_pgto_sel, status_rc_sel=status_rc_sel, prazo_sel=prazo_sel,
+                       prazo_texto=prazo_texto, loja_texto=loja_texto, pedido_texto=pedido_texto, busca_texto=busca_texto,
+                       situacao_prazo_sel=situacao_prazo_sel, atraso_faixa=atraso_faixa)
+        pos = memo.posicoes(versao, filtros, motor, indice_busca)
+        return df if pos is None else df.iloc[pos]
+    if motor is not None:
+        # junta as posições pré-indexadas e materializa só o subconjunto final
+        pos = motor.posicoes(
+            selecoes=montar_selecoes(coord_sel, forn_sel, projeto_sel, status_ticket_sel, status_pgto_sel, status_rc_sel, prazo_sel,
+                                     situacao_prazo_sel),
+            textos={"PRAZO": prazo_texto, "LOJA": loja_texto, "PEDIDO": pedido_texto},
+            faixas={COL_DIAS_ATRASO: atraso_faixa},
+        )
+        if busca_texto and indice_busca is not None:
+            pos = interseccao(pos, indice_busca.buscar(busca_texto))
+            busca_texto = ""
+        f = df if pos is None else df.iloc[pos]
+    else:
+        f = df
+        if coord_sel and "COORDENADOR" in f.columns:
+            f = f[f["COORDENADOR"].isin(coord_sel)]
+        if forn_sel and "FORNECEDOR" in f.columns:
+            f = f[f["FORNECEDOR"].isin(forn_sel)]
+        if projeto_sel and "PROJETO" in f.columns:
+            f = f[f["PROJETO"].isin(projeto_sel)]
+        if status_rc_sel and "STATUS RC" in f.columns:
+            f = f[f["STATUS RC"].isin(status_rc_sel)]
+        if status_ticket_sel and "CHAMADO" in f.columns:
+            f = f[f["CHAMADO"].isin(status_ticket_sel)]
+        if status_pgto_sel and "STATUS RESULT1" in f.columns:
+            f = f[f["STATUS RESULT1"].isin(status_pgto_sel)]
+        if prazo_sel and "PRAZO" in f.columns:
+            f = f[f["PRAZO"].isin(prazo_sel)]
+        if situacao_prazo_sel and COL_SITUACAO_PRAZO in f.columns:
+            f = f[f[COL_SITUACAO_PRAZO].isin(situacao_prazo_sel)]
+        if atraso_faixa and COL_DIAS_ATRASO in f.columns:
+            minimo, maximo = atraso_faixa
+            dias = f[COL_DIAS_ATRASO]
+            f = f[dias.notna() & (minimo is None or dias >= minimo) & (maximo is None or dias <= maximo)]
+        if prazo_texto and "PRAZO" in f.columns:
+            f = f[f["PRAZO"].astype(str).str.contains(prazo_texto, na=False, case=False)]
+        if loja_texto and "LOJA" in f.columns:
+            f = f[f["LOJA"].astype(str).str.contains(loja_texto, na=False, case=False)]
+        if pedido_texto and "PEDIDO" in f.columns:
+            f = f[f["PEDIDO"].astype(str).str.contains(pedido_texto, na=False, case=False)]
+    if busca_texto and indice_busca is not None:
+        f = indice_busca.filtrar(f, busca_texto)
+    elif busca_texto:
+        q = busca_texto.lower()
+        f = f[f.apply(lambda r: q in (" ".join(r.astype(str))).lower(), axis=1)]
+    return f
+
+
+def assinatura_agregado(agreg: pd.DataFrame) -> str:
+    # conteúdo + ordem das linhas: serve de chave para figuras montadas a partir da agregação
+    h = hashlib.sha1("|".join(map(str, agreg.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(agreg, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def ordenar_grupos(agreg: pd.DataFrame, eixo: str) -> pd.DataFrame:
+    # ordem única dos grupos (pandas, cubo e SQL): chave crescente pelo texto, vazio por último, e depois
+    # QTD_TICKETS decrescente estável, para os empates não mudarem de lugar conforme o caminho que respondeu
+    vazio = agreg[eixo].isna().to_numpy()
+    texto = np.asarray(agreg[eixo].astype(str), dtype=str)
+    agreg = agreg.iloc[np.lexsort((texto, vazio))]
+    return agreg.sort_values("QTD_TICKETS", ascending=False, kind="stable")
+
+
+def agregar(df: pd.DataFrame, eixo: str, ref_data_col: str = None, excluir_nulos_eixo: bool = False) -> pd.DataFrame:
+    f = df.copy(deep=False)
+    if eixo == "MÊS":
+        if ref_data_col not in f.columns:
+            raise ValueError("A coluna de data '{}' não existe.".format(ref_data_col))
+        # mês como código inteiro (calculado na carga); sem data vai para o fim, como o NaT na ordenação
+        cod = f[coluna_mes(ref_data_col)].to_numpy() if coluna_mes(ref_data_col) in f.columns else codigo_mes(f[ref_data_col])
+        f["_MES"] = np.where(cod >= 0, cod, np.iinfo(np.int32).max)
+        grupo = "_MES"
+        if excluir_nulos_eixo:
+            f = f[cod >= 0]
+    elif eixo == "PROJETO":
+        if "PROJETO" not in f.columns:
+            raise ValueError("Coluna 'PROJETO' não encontrada.")
+        grupo = "PROJETO"
+        if excluir_nulos_eixo:
+            f = f[f["PROJETO"].notna() & (f["PROJETO"].astype(str).str.strip() != "")]
+    elif eixo == "COORDENADOR":
+        if "COORDENADOR" not in f.columns:
+            raise ValueError("Coluna 'COORDENADOR' não encontrada.")
+        grupo = "COORDENADOR"
+        if excluir_nulos_eixo:
+            f = f[f["COORDENADOR"].notna() & (f["COORDENADOR"].astype(str).str.strip() != "")]
+    else:
+        raise ValueError("Eixo inválido. Use 'MÊS', 'PROJETO' ou 'COORDENADOR'.")
+
+    for c in COLUNAS_VALOR:
+        if c in f.columns:
+            f[c] = converter_moeda_serie(f[c]).fillna(0)
+
+    agreg = f.groupby(grupo, dropna=False, observed=True).agg({
+        "VALOR RC": "sum" if "VALOR RC" in f.columns else "size",
+        "VALOR A PAGAR": "sum" if "VALOR A PAGAR" in f.columns else "size",
+        "VALOR BI": "sum" if "VALOR BI" in f.columns else "size",
+        grupo: "size"
+    }).rename(columns={grupo: "QTD_TICKETS"}).reset_index()
+
+    if eixo == "MÊS":
+        # groupby já ordena pelo código (ordem cronológica); só troca o código pelo rótulo "AAAA-MM"
+        agreg = agreg.rename(columns={"_MES": "MÊS"})
+        agreg["MÊS"] = [rotulo_mes(c) if c != np.iinfo(np.int32).max else np.nan for c in agreg["MÊS"]]
+    else:
+        agreg = ordenar_grupos(agreg, grupo)
+    return agreg
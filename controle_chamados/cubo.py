@@ -0,0 +1,113 @@
+# controle_chamados/cubo.py — cubo de agregação pré-calculado para os gráficos / tabela agregada
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .consulta import ordenar_grupos
+from .moeda import COLUNAS_VALOR, converter_moeda_serie
+from .prazo import COL_SITUACAO_PRAZO
+from .sla import codigo_mes, coluna_mes, rotulo_mes
+
+# dimensões do cubo: eixos dos gráficos + filtros de seleção da barra lateral
+# (a situação do prazo é função de PRAZO: não aumenta o número de grupos)
+DIMENSOES_CUBO = ["PROJETO", "COORDENADOR", "FORNECEDOR", "STATUS RC", "CHAMADO", "STATUS RESULT1", "PRAZO", COL_SITUACAO_PRAZO]
+EIXOS = ["MÊS", "PROJETO", "COORDENADOR"]
+
+
+class CuboAgregacao:
+    # soma dos VALOR e contagem por (mês × dimensões); respostas memorizadas por filtro
+
+    def __init__(self, df: pd.DataFrame, dimensoes: list = None, max_respostas: int = 256):
+        self._df = df
+        self.dimensoes = [c for c in (dimensoes or DIMENSOES_CUBO) if c in df.columns]
+        self.categorias = {}
+        self._codigos = {}
+        for c in self.dimensoes:
+            cat = pd.Categorical(df[c])
+            self.categorias[c] = cat.categories
+            self._codigos[c] = cat.codes.astype(np.int32)
+        self._valores = {}
+        for c in COLUNAS_VALOR:
+            if c in df.columns:
+                self._valores[c] = converter_moeda_serie(df[c]).fillna(0).to_numpy()
+        self._cubos = {}
+        self._respostas = OrderedDict()
+        self._max_respostas = max_respostas
+        self._lock = threading.Lock()
+
+    def cubo(self, ref_data_col: str = None) -> pd.DataFrame:
+        # um cubo por coluna de data de referência, montado na primeira vez que é pedido
+        with self._lock:
+            if ref_data_col in self._cubos:
+                return self._cubos[ref_data_col]
+        base = pd.DataFrame(self._codigos)
+        if ref_data_col and coluna_mes(ref_data_col) in self._df.columns:
+            base["_MES"] = self._df[coluna_mes(ref_data_col)].to_numpy()  # código já calculado na carga
+        else:
+            base["_MES"] = codigo_mes(self._df[ref_data_col]) if ref_data_col else -1
+        for c, v in self._valores.items():
+            base[c] = v
+        chaves = ["_MES"] + self.dimensoes
+        cubo = base.groupby(chaves, sort=False).agg(
+            **{c: (c, "sum") for c in self._valores}, QTD_TICKETS=("_MES", "size")
+        ).reset_index()
+        with self._lock:
+            self._cubos[ref_data_col] = cubo
+        return cubo
+
+    def _codigos_selecao(self, coluna: str, valores) -> np.ndarray:
+        ids = self.categorias[coluna].get_indexer(pd.Index(list(valores)))
+        return ids[ids >= 0]
+
+    def agregar(self, eixo: str, ref_data_col: str = None, excluir_nulos_eixo: bool = False, selecoes: dict = None) -> pd.DataFrame:
+        if eixo not in EIXOS:
+            raise ValueError("Eixo inválido. Use 'MÊS', 'PROJETO' ou 'COORDENADOR'.")
+        if eixo == "MÊS" and ref_data_col not in self._df.columns:
+            raise ValueError(f"A coluna de data '{ref_data_col}' não existe.")
+        if eixo != "MÊS" and eixo not in self.categorias:
+            raise ValueError(f"Coluna '{eixo}' não encontrada.")
+
+        selecoes = {c: tuple(sorted(map(str, v))) for c, v in (selecoes or {}).items() if v}
+        chave = (eixo, ref_data_col if eixo == "MÊS" else None, bool(excluir_nulos_eixo), tuple(sorted(selecoes.items())))
+        with self._lock:
+            if chave in self._respostas:
+                self._respostas.move_to_end(chave)
+                return self._respostas[chave]
+
+        cubo = self.cubo(ref_data_col if eixo == "MÊS" else None)
+        mask = np.ones(len(cubo), dtype=bool)
+        for c, valores in selecoes.items():
+            if c not in self.categorias:
+                continue
+            mask &= np.isin(cubo[c].to_numpy(), self._codigos_selecao(c, valores))
+        col_eixo = "_MES" if eixo == "MÊS" else eixo
+        parte = cubo[mask]
+        if excluir_nulos_eixo:
+            parte = parte[parte[col_eixo] >= 0]
+
+        agreg = parte.groupby(col_eixo, sort=False)[list(self._valores) + ["QTD_TICKETS"]].sum()
+        for c in COLUNAS_VALOR:
+            if c not in agreg.columns:
+                agreg[c] = agreg["QTD_TICKETS"]  # mesmo "size" do agregar original
+        agreg = agreg[COLUNAS_VALOR + ["QTD_TICKETS"]].reset_index()
+
+        if eixo == "MÊS":
+            agreg = agreg.assign(_ORD=agreg["_MES"].where(agreg["_MES"] >= 0, np.iinfo(np.int32).max))
+            agreg = agreg.sort_values("_ORD", kind="stable").drop(columns=["_ORD"])
+            rotulos = [rotulo_mes(c) for c in agreg["_MES"]]
+        else:
+            cats = self.categorias[eixo]
+            rotulos = [cats[c] if c >= 0 else np.nan for c in agreg[eixo]]
+        agreg = agreg.drop(columns=[col_eixo])
+        agreg.insert(0, eixo, rotulos)
+        if eixo != "MÊS":
+            agreg = ordenar_grupos(agreg, eixo)
+        agreg = agreg.reset_index(drop=True)
+
+        with self._lock:
+            self._respostas[chave] = agreg
+            while len(self._respostas) > self._max_respostas:
+                self._respostas.popitem(last=False)
+        return agreg
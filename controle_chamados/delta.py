@@ -0,0 +1,142 @@
+# controle_chamados/delta.py — detecção de mudança na planilha e recarga incremental por linha
+import hashlib, json, os, re, threading
+
+import numpy as np
+import pandas as pd
+
+from .snapshot import DIR_SNAPSHOT, VERSAO_FORMATO, gravar_snapshot, hash_arquivo, ler_snapshot
+
+# chave de linha pelos identificadores (CHAMADO é status e muda com o andamento) e hash do conteúdo bruto
+CHAVES_LINHA = ["PEDIDO", "NOTA"]
+COL_CHAVE = "_CHAVE_LINHA"
+COL_HASH = "_HASH_LINHA"
+
+
+class MonitorArquivo:
+    # impressão digital por arquivo: stat (mtime + tamanho) sempre, hash só quando o stat muda
+
+    def __init__(self):
+        self._impressoes = {}
+        self._lock = threading.Lock()
+
+    def verificar(self, caminho: str):
+        # devolve (versão atual, versão anterior se o conteúdo mudou desde a última verificação)
+        st_ = os.stat(caminho)
+        rapida = (st_.st_mtime_ns, st_.st_size)
+        with self._lock:
+            anterior = self._impressoes.get(caminho)
+        if anterior and anterior[0] == rapida:
+            return anterior[1], None
+        versao = hash_arquivo(caminho)[:16]
+        with self._lock:
+            self._impressoes[caminho] = (rapida, versao)
+        if anterior and anterior[1] != versao:
+            return versao, anterior[1]
+        return versao, None
+
+
+MONITOR = MonitorArquivo()
+
+
+# "123.50" -> ("123", "5"); "123.0" -> ("123", "")
+_RE_DECIMAL = re.compile(r"^(-?\d+)\.(\d*?)0*$")
+
+
+def _normalizar_valor(v) -> str:
+    # mesmo texto para o mesmo valor em qualquer tipo lido: 123 / 123.0 / "123" / " 123.0 " -> "123"
+    if v is None or v is pd.NA or v is pd.NaT or (isinstance(v, (float, np.floating)) and np.isnan(v)):
+        return ""
+    if isinstance(v, (bool, np.bool_)):
+        return str(bool(v))
+    if isinstance(v, (int, np.integer)):
+        return str(int(v))
+    if isinstance(v, (float, np.floating)):
+        return str(int(v)) if float(v).is_integer() else repr(float(v))
+    s = str(v).strip()
+    m = _RE_DECIMAL.match(s)
+    if m:
+        return m.group(1) + ("." + m.group(2) if m.group(2) else "")
+    return s
+
+
+def _textos_normalizados(serie: pd.Series) -> np.ndarray:
+    # normaliza cada valor distinto uma vez só (código -1 = vazio)
+    codigos, valores = pd.factorize(serie.astype(object))
+    textos = np.array([_normalizar_valor(v) for v in valores] + [""], dtype=object)
+    return textos[codigos]
+
+
+def impressao_linhas(bruto: pd.DataFrame, chaves: list = None) -> pd.DataFrame:
+    # hashes sobre o texto normalizado: int <-> float entre leituras não muda chave nem conteúdo
+    normalizado = pd.DataFrame({c: _textos_normalizados(bruto[c]) for c in bruto.columns}, index=bruto.index)
+    conteudo = pd.util.hash_pandas_object(normalizado, index=False).to_numpy()
+    cols = [c for c in (chaves or CHAVES_LINHA) if c in bruto.columns]
+    if cols:
+        base = pd.util.hash_pandas_object(normalizado[cols], index=False).to_numpy()
+    else:
+        base = np.zeros(len(bruto), dtype=np.uint64)
+    # chave repetida (ex.: PEDIDO e NOTA vazios) desempata pelo conteúdo, não pela posição: inserir uma linha
+    # não desloca as outras; a ocorrência só conta entre linhas idênticas
+    repetida = pd.Series(base).duplicated(keep=False).to_numpy()
+    desempate = np.where(repetida, conteudo, np.uint64(0))
+    ocorrencia = pd.DataFrame({"k": base, "d": desempate}).groupby(["k", "d"]).cumcount().to_numpy()
+    chave = pd.util.hash_pandas_object(pd.DataFrame({"k": base, "d": desempate, "o": ocorrencia}), index=False)
+    return pd.DataFrame(
+        {COL_CHAVE: chave.to_numpy().astype(np.int64), COL_HASH: conteudo.astype(np.int64)},
+        index=bruto.index,
+    )
+
+
+def calcular_delta(linhas_anteriores: pd.DataFrame, linhas_novas: pd.DataFrame) -> dict:
+    hash_ant = linhas_anteriores.set_index(COL_CHAVE)[COL_HASH]
+    casado = hash_ant.reindex(linhas_novas[COL_CHAVE].to_numpy())
+    existe = casado.notna().to_numpy()
+    iguais = existe & (casado.to_numpy() == linhas_novas[COL_HASH].to_numpy())
+    removidos = int((~hash_ant.index.isin(linhas_novas[COL_CHAVE])).sum())
+    return {
+        "iguais": iguais,
+        "inseridos": int((~existe).sum()),
+        "atualizados": int((existe & ~iguais).sum()),
+        "removidos": removidos,
+    }
+
+
+def aplicar_delta(saneado_anterior: pd.DataFrame, linhas_novas: pd.DataFrame, delta: dict, saneados_novos: pd.DataFrame) -> pd.DataFrame:
+    # linhas iguais vêm do snapshot anterior (reindexadas para a posição nova); o resto já chega saneado
+    iguais = linhas_novas[delta["iguais"]]
+    nova_posicao = pd.Series(iguais.index, index=iguais[COL_CHAVE].to_numpy())
+    mantidos = saneado_anterior[saneado_anterior[COL_CHAVE].isin(nova_posicao.index)].copy()
+    mantidos.index = nova_posicao.reindex(mantidos[COL_CHAVE].to_numpy()).to_numpy()
+    saneados_novos = saneados_novos.assign(**{COL_CHAVE: linhas_novas[COL_CHAVE].reindex(saneados_novos.index)})
+    return pd.concat([mantidos, saneados_novos]).sort_index()
+
+
+def _arquivo_ultimo(caminho_excel: str, aba: str, opcoes: dict) -> str:
+    ident = json.dumps(
+        {"arquivo": os.path.abspath(caminho_excel), "aba": aba, "opcoes": opcoes, "formato": VERSAO_FORMATO},
+        ensure_ascii=False, sort_keys=True, default=str,
+    )
+    return os.path.join(DIR_SNAPSHOT, f"ultimo_{hashlib.sha256(ident.encode('utf-8')).hexdigest()[:32]}.txt")
+
+
+def snapshot_anterior(caminho_excel: str, aba: str, opcoes: dict, colunas: list):
+    # último snapshot gravado para este arquivo/aba/opções (de uma versão anterior da planilha)
+    try:
+        with open(_arquivo_ultimo(caminho_excel, aba, opcoes), encoding="utf-8") as fh:
+            chave = fh.read().strip()
+    except OSError:
+        return None
+    saneado = ler_snapshot(chave, colunas + [COL_CHAVE])
+    linhas = ler_snapshot(f"{chave}-linhas", [COL_CHAVE, COL_HASH])
+    if saneado is None or linhas is None or COL_CHAVE not in saneado.columns:
+        return None
+    return saneado, linhas
+
+
+def gravar_com_linhas(df: pd.DataFrame, linhas: pd.DataFrame, chave: str, caminho_excel: str, aba: str, opcoes: dict) -> None:
+    if gravar_snapshot(df, chave) and gravar_snapshot(linhas, f"{chave}-linhas"):
+        try:
+            with open(_arquivo_ultimo(caminho_excel, aba, opcoes), "w", encoding="utf-8") as fh:
+                fh.write(chave)
+        except OSError:
+            pass
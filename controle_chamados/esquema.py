@@ -0,0 +1,98 @@
+# controle_chamados/esquema.py — colunas da base (schema mínimo da planilha) e seus tipos
+import pandas as pd
+
+COLUNAS_BASE = [
+    "EMP","FILIAL","LOJA","CNPJ","COORDENADOR","PROJETO","SERVIÇO","NOTA","FORNECEDOR",
+    "VALOR RC","VALOR A PAGAR","VALOR BI","STATUS RC","PEDIDO","CHAMADO","DATA_PGTO_SAP",
+    "MIRO","STATUS RESULT1","DATA CRIAÇÃO TICKET","PRAZO","DATA CRIAÇÃO TICKET BR","DATA CRIAÇÃO RC"
+]
+
+COLUNAS_CHAVE_VAZIAS = [
+    "EMP","FILIAL","LOJA","CNPJ","COORDENADOR","PROJETO","SERVIÇO","NOTA","FORNECEDOR",
+    "STATUS RC","PEDIDO","CHAMADO","STATUS RESULT1","PRAZO"
+]
+
+COLUNAS_DATA = ["DATA_PGTO_SAP","DATA CRIAÇÃO TICKET","DATA CRIAÇÃO RC","DATA CRIAÇÃO TICKET BR"]
+
+# Colunas mantidas no snapshot Parquet servido ao app (poda colunar)
+COLUNAS_SNAPSHOT = list(dict.fromkeys(COLUNAS_BASE + COLUNAS_DATA))
+
+# colunas categóricas normalizadas (UPPER + trim + colapsar espaços)
+CATEGORIAS_NORMALIZAR = ["COORDENADOR", "FORNECEDOR", "PROJETO"]
+
+# tipo compacto de cada coluna (aplicado uma vez no saneamento):
+#   category -> poucos valores distintos repetidos; string -> texto livre/identificador com letras
+#   Int32    -> identificador numérico (vira Int64 se passar do limite, string se houver texto no meio)
+#   float64  -> valores em R$; datetime64 -> datas
+ESQUEMA_BASE = {
+    "EMP": "category",
+    "FILIAL": "category",
+    "LOJA": "string",
+    "CNPJ": "string",
+    "COORDENADOR": "category",
+    "PROJETO": "category",
+    "SERVIÇO": "category",
+    "NOTA": "Int32",
+    "FORNECEDOR": "category",
+    "VALOR RC": "float64",
+    "VALOR A PAGAR": "float64",
+    "VALOR BI": "float64",
+    "STATUS RC": "category",
+    "PEDIDO": "Int32",
+    "CHAMADO": "category",
+    "DATA_PGTO_SAP": "datetime64",
+    "MIRO": "Int32",
+    "STATUS RESULT1": "category",
+    "DATA CRIAÇÃO TICKET": "datetime64",
+    "PRAZO": "category",
+    "DATA CRIAÇÃO TICKET BR": "datetime64",
+    "DATA CRIAÇÃO RC": "datetime64",
+}
+
+_LIMITE_INT32 = 2**31 - 1
+
+
+def _inteiro_compacto(serie: pd.Series) -> pd.Series:
+    if pd.api.types.is_integer_dtype(serie.dtype):
+        num = serie
+    else:
+        num = pd.to_numeric(serie, errors="coerce")
+        # texto no meio ("6166/6271") ou número quebrado: não perde nada, fica como string
+        if (num.isna() & serie.notna()).any() or (num.dropna() % 1 != 0).any():
+            return serie.astype("string")
+    maior = num.abs().max()
+    return num.astype("Int32" if pd.isna(maior) or maior <= _LIMITE_INT32 else "Int64")
+
+
+def aplicar_esquema(df: pd.DataFrame, esquema: dict = None) -> pd.DataFrame:
+    f = df.copy(deep=False)
+    for c, tipo in (esquema or ESQUEMA_BASE).items():
+        if c not in f.columns:
+            continue
+        s = f[c]
+        if tipo == "Int32":
+            f[c] = _inteiro_compacto(s)
+        elif tipo.startswith("datetime64"):
+            if not pd.api.types.is_datetime64_any_dtype(s.dtype):
+                f[c] = pd.to_datetime(s, errors="coerce")
+        elif tipo == "float64":
+            if s.dtype != "float64":
+                f[c] = pd.to_numeric(s, errors="coerce").astype("float64")
+        elif str(s.dtype) != tipo:
+            f[c] = s.astype(tipo)
+    return f
+
+
+def relatorio_memoria(df: pd.DataFrame) -> pd.DataFrame:
+    # memória por coluna no tipo atual x em object (como a planilha chega do Excel, antes do esquema);
+    # colunas "_" derivadas não existiam na planilha e não entram na economia
+    linhas = []
+    for c in df.columns:
+        s = df[c]
+        atual = int(s.memory_usage(deep=True, index=False))
+        if str(c).startswith("_"):
+            bruto = atual
+        else:
+            bruto = int(s.astype(object).memory_usage(deep=True, index=False))
+        linhas.append({"COLUNA": c, "TIPO": str(s.dtype), "BYTES": atual, "BYTES_OBJECT": bruto, "ECONOMIA": bruto - atual})
+    return pd.DataFrame(linhas)
@@ -0,0 +1,45 @@
+# controle_chamados/exportacao.py — exportação do resultado filtrado (CSV / XLSX / Parquet)
+import codecs, io
+
+import pandas as pd
+
+FORMATOS_EXPORTACAO = {
+    "CSV": ("csv", "text/csv"),
+    "XLSX": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "Parquet": ("parquet", "application/octet-stream"),
+}
+
+TAMANHO_BLOCO = 50_000
+
+
+def exportar_csv(df: pd.DataFrame, tamanho_bloco: int = TAMANHO_BLOCO) -> bytes:
+    # mesmo formato do download original (sep=";" + utf-8-sig), escrito em blocos
+    buf = io.BytesIO()
+    buf.write(codecs.BOM_UTF8)  # BOM uma vez só, no início
+    for inicio in range(0, max(len(df), 1), tamanho_bloco):
+        bloco = df.iloc[inicio:inicio + tamanho_bloco]
+        buf.write(bloco.to_csv(index=False, sep=";", header=(inicio == 0)).encode("utf-8"))
+    return buf.getvalue()
+
+
+def exportar_xlsx(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        df.to_excel(writer, index=False, sheet_name="FILTRADO")
+    return buf.getvalue()
+
+
+def exportar_parquet(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    df.to_parquet(buf, index=False)
+    return buf.getvalue()
+
+
+def exportar(df: pd.DataFrame, formato: str) -> bytes:
+    if formato == "CSV":
+        return exportar_csv(df)
+    if formato == "XLSX":
+        return exportar_xlsx(df)
+    if formato == "Parquet":
+        return exportar_parquet(df)
+    raise ValueError(f"Formato de exportação inválido: {formato}. Use {list(FORMATOS_EXPORTACAO)}.")
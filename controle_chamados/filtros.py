@@ -0,0 +1,251 @@
+# controle_chamados/filtros.py — filtros da barra lateral sobre categorias pré-indexadas
+import hashlib, json, re
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .busca import normalizar_texto
+from .prazo import COL_DIAS_ATRASO, COL_SITUACAO_PRAZO, SITUACOES_PRAZO
+
+# colunas com multiselect (valores exatos), com filtro "contém texto" e com faixa numérica (mín, máx)
+COLUNAS_SELECAO = ["COORDENADOR", "FORNECEDOR", "PROJETO", "STATUS RC", "CHAMADO", "STATUS RESULT1", "PRAZO", COL_SITUACAO_PRAZO]
+COLUNAS_TEXTO = ["PRAZO", "LOJA", "PEDIDO"]
+COLUNAS_FAIXA = [COL_DIAS_ATRASO]
+
+# argumentos de aplicar_filtros -> coluna da base
+ARGS_SELECAO = {
+    "coord_sel": "COORDENADOR", "forn_sel": "FORNECEDOR", "projeto_sel": "PROJETO", "status_rc_sel": "STATUS RC",
+    "status_ticket_sel": "CHAMADO", "status_pgto_sel": "STATUS RESULT1", "prazo_sel": "PRAZO",
+    "situacao_prazo_sel": COL_SITUACAO_PRAZO,
+}
+ARGS_TEXTO = {"prazo_texto": "PRAZO", "loja_texto": "LOJA", "pedido_texto": "PEDIDO"}
+ARGS_FAIXA = {"atraso_faixa": COL_DIAS_ATRASO}
+RE_METACARACTERES = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+def validar_regex(coluna: str, texto: str) -> None:
+    # trecho com metacaracteres é regex (str.contains / REGEXP): inválido vira ValueError com o nome do filtro
+    if texto and RE_METACARACTERES.search(texto):
+        try:
+            re.compile(texto)
+        except re.error as e:
+            raise ValueError(f"Texto inválido no filtro de {coluna}: {texto!r} ({e}).") from None
+
+
+def montar_selecoes(coord_sel, forn_sel, projeto_sel, status_ticket_sel, status_pgto_sel, status_rc_sel, prazo_sel,
+                    situacao_prazo_sel=None) -> dict:
+    # widgets da barra lateral -> coluna da base
+    return {
+        "COORDENADOR": coord_sel, "FORNECEDOR": forn_sel, "PROJETO": projeto_sel,
+        "STATUS RC": status_rc_sel, "CHAMADO": status_ticket_sel,
+        "STATUS RESULT1": status_pgto_sel, "PRAZO": prazo_sel, COL_SITUACAO_PRAZO: situacao_prazo_sel,
+    }
+
+
+def opcoes_filtros(df: pd.DataFrame) -> dict:
+    # listas dos multiselects (valores distintos ordenados) e limites das faixas, uma vez por versão da base
+    opcoes = {}
+    for c in COLUNAS_SELECAO:
+        if c not in df.columns:
+            continue
+        if c == COL_SITUACAO_PRAZO:
+            presentes = set(df[c].dropna().unique().tolist())
+            opcoes[c] = [s for s in SITUACOES_PRAZO if s in presentes]
+        else:
+            opcoes[c] = sorted(df[c].dropna().unique().tolist())
+    for c in COLUNAS_FAIXA:
+        if c in df.columns and df[c].notna().any():
+            opcoes[c] = (int(df[c].min()), int(df[c].max()))
+    return opcoes
+
+
+def assinatura_filtros(**filtros) -> str:
+    # chave canônica: ordem das seleções nos multiselects não importa
+    canon = {k: sorted(map(str, v)) if isinstance(v, (list, tuple, set)) else v for k, v in filtros.items()}
+    texto = json.dumps(canon, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+
+def interseccao(a, b):
+    # None = "sem restrição"; as duas listas de posições chegam ordenadas
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if len(a) > len(b):
+        a, b = b, a
+    idx = np.searchsorted(b, a)
+    idx[idx == len(b)] = 0
+    return a[b[idx] == a]
+
+
+class MotorFiltros:
+    # cada coluna vira um Categorical; por categoria guardamos as posições das linhas
+
+    def __init__(self, df: pd.DataFrame, colunas: list = None):
+        self.n_linhas = len(df)
+        self.categoricos = {}
+        self._ordem = {}
+        self._inicio = {}
+        # faixas: valores como float (nulo = NaN, nunca entra numa faixa)
+        self.numericos = {c: df[c].to_numpy(dtype="float64", na_value=np.nan) for c in COLUNAS_FAIXA if c in df.columns}
+        for c in colunas or list(dict.fromkeys(COLUNAS_SELECAO + COLUNAS_TEXTO)):
+            if c not in df.columns:
+                continue
+            cat = pd.Categorical(df[c])
+            ordem = np.argsort(cat.codes, kind="stable").astype(np.int32)
+            self.categoricos[c] = cat
+            self._ordem[c] = ordem
+            # códigos -1 (nulos) ficam no começo e nunca entram em uma seleção
+            self._inicio[c] = np.searchsorted(cat.codes[ordem], np.arange(len(cat.categories) + 1))
+
+    def _ids_valores(self, coluna: str, valores) -> np.ndarray:
+        ids = self.categoricos[coluna].categories.get_indexer(pd.Index(list(valores)))
+        return np.unique(ids[ids >= 0])
+
+    def _ids_contendo(self, coluna: str, texto: str) -> np.ndarray:
+        # mesma regra do str.contains(case=False), mas avaliada só nos valores distintos
+        cats = pd.Series(self.categoricos[coluna].categories.astype(str))
+        return np.flatnonzero(cats.str.contains(texto, na=False, case=False).to_numpy())
+
+    def _posicoes(self, coluna: str, ids) -> np.ndarray:
+        ordem, inicio = self._ordem[coluna], self._inicio[coluna]
+        partes = [ordem[inicio[i]:inicio[i + 1]] for i in ids]
+        if not partes:
+            return np.empty(0, dtype=np.int32)
+        return np.sort(np.concatenate(partes))
+
+    def posicoes_valores(self, coluna: str, valores) -> np.ndarray:
+        return self._posicoes(coluna, self._ids_valores(coluna, valores))
+
+    def posicoes_contendo(self, coluna: str, texto: str) -> np.ndarray:
+        return self._posicoes(coluna, self._ids_contendo(coluna, texto))
+
+    def _na_faixa(self, coluna: str, faixa, pos=None) -> np.ndarray:
+        minimo, maximo = faixa
+        v = self.numericos[coluna] if pos is None else self.numericos[coluna][pos]
+        return (v >= (-np.inf if minimo is None else minimo)) & (v <= (np.inf if maximo is None else maximo))
+
+    def posicoes_faixa(self, coluna: str, faixa) -> np.ndarray:
+        return np.flatnonzero(self._na_faixa(coluna, faixa)).astype(np.int32)
+
+    def posicoes_em(self, candidatas: np.ndarray, selecoes: dict, textos: dict, faixas: dict = None) -> np.ndarray:
+        # mesmos critérios de posicoes(), conferidos pelos códigos só nas linhas candidatas
+        pos = candidatas
+        for c, faixa in (faixas or {}).items():
+            if faixa and c in self.numericos:
+                pos = pos[self._na_faixa(c, faixa, pos)]
+        criterios = [(c, self._ids_valores, v) for c, v in selecoes.items() if v and c in self.categoricos]
+        criterios += [(c, self._ids_contendo, t) for c, t in textos.items() if t and c in self.categoricos]
+        for c, ids_de, valor in criterios:
+            pos = pos[np.isin(self.categoricos[c].codes[pos], ids_de(c, valor))]
+            if len(pos) == 0:
+                break
+        return pos
+
+    def posicoes(self, selecoes: dict, textos: dict, faixas: dict = None):
+        # selecoes: coluna -> valores escolhidos; textos: coluna -> trecho buscado; faixas: coluna -> (mín, máx)
+        listas = [self.posicoes_faixa(c, f) for c, f in (faixas or {}).items() if f and c in self.numericos]
+        for c, valores in selecoes.items():
+            if valores and c in self.categoricos:
+                listas.append(self.posicoes_valores(c, valores))
+        for c, texto in textos.items():
+            if texto and c in self.categoricos:
+                listas.append(self.posicoes_contendo(c, texto))
+        res = None
+        for pos in sorted(listas, key=len):  # começa pela menor para encolher rápido
+            res = interseccao(res, pos)
+            if len(res) == 0:
+                break
+        return res
+
+
+def _canonicos(filtros: dict) -> dict:
+    # faixas mantêm a ordem (mín, máx); seleções viram conjuntos ordenados
+    return {
+        k: (tuple(v) if v else "") if k in ARGS_FAIXA else
+        tuple(sorted(map(str, v))) if isinstance(v, (list, tuple, set)) else (v or "")
+        for k, v in filtros.items()
+    }
+
+
+def _faixa_dentro(anterior: tuple, nova: tuple) -> bool:
+    (a_min, a_max), (n_min, n_max) = anterior, nova
+    return (a_min is None or (n_min is not None and n_min >= a_min)) and (a_max is None or (n_max is not None and n_max <= a_max))
+
+
+def _texto_estreita(anterior: str, novo: str, busca: bool) -> bool:
+    # "contém novo" implica "contém anterior" quando anterior é trecho de novo (e nenhum dos dois é regex)
+    if busca:
+        return normalizar_texto(anterior).strip() in normalizar_texto(novo)
+    literais = not RE_METACARACTERES.search(anterior) and not RE_METACARACTERES.search(novo)
+    return literais and anterior.lower() in novo.lower()
+
+
+def refina(anterior: dict, novo: dict) -> bool:
+    # True se todo resultado de `novo` já está no resultado de `anterior` (filtros canônicos)
+    for k, a in anterior.items():
+        n = novo.get(k)
+        if not a:
+            continue
+        if not n:
+            return False
+        if k in ARGS_SELECAO:
+            if not set(n) <= set(a):
+                return False
+        elif k in ARGS_FAIXA:
+            if not _faixa_dentro(a, n):
+                return False
+        elif not _texto_estreita(a, n, busca=(k == "busca_texto")):
+            return False
+    return True
+
+
+class MemoFiltros:
+    # por sessão: posições do resultado por assinatura (filtros + versão da base); filtro que só estreita
+    # um resultado guardado é avaliado nas linhas dele, e não na base inteira
+
+    def __init__(self, max_entradas: int = 8):
+        self.max_entradas = max_entradas
+        self.ultimo = None  # "memo" | "refinado" | "completo"
+        self._itens = OrderedDict()  # assinatura -> (versão, filtros canônicos, posições ou None)
+
+    def _guardar(self, chave, versao, canon, pos):
+        self._itens[chave] = (versao, canon, pos)
+        while len(self._itens) > self.max_entradas:
+            self._itens.popitem(last=False)
+
+    def posicoes(self, versao, filtros: dict, motor: MotorFiltros, indice_busca=None):
+        # None = sem restrição (todas as linhas), como em MotorFiltros.posicoes
+        chave = assinatura_filtros(versao=versao, **filtros)
+        if chave in self._itens:
+            self._itens.move_to_end(chave)
+            self.ultimo = "memo"
+            return self._itens[chave][2]
+
+        canon = _canonicos(filtros)
+        anteriores = [(c, p) for v, c, p in self._itens.values() if v == versao and p is not None and refina(c, canon)]
+        if anteriores:
+            anterior, candidatas = min(anteriores, key=lambda cp: len(cp[1]))
+            mudou = {k: v for k, v in canon.items() if v and v != anterior.get(k)}
+            pos = motor.posicoes_em(
+                candidatas,
+                selecoes={ARGS_SELECAO[k]: v for k, v in mudou.items() if k in ARGS_SELECAO},
+                textos={ARGS_TEXTO[k]: v for k, v in mudou.items() if k in ARGS_TEXTO},
+                faixas={ARGS_FAIXA[k]: v for k, v in mudou.items() if k in ARGS_FAIXA},
+            )
+            if mudou.get("busca_texto") and indice_busca is not None:
+                pos = indice_busca.buscar_em(mudou["busca_texto"], pos)
+            self.ultimo = "refinado"
+        else:
+            pos = motor.posicoes(
+                selecoes={col: canon.get(k) for k, col in ARGS_SELECAO.items()},
+                textos={col: canon.get(k) for k, col in ARGS_TEXTO.items()},
+                faixas={col: canon.get(k) for k, col in ARGS_FAIXA.items()},
+            )
+            if canon.get("busca_texto") and indice_busca is not None:
+                pos = interseccao(pos, indice_busca.buscar(canon["busca_texto"]))
+            self.ultimo = "completo"
+        self._guardar(chave, versao, canon, pos)
+        return pos
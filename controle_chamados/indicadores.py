@@ -0,0 +1,103 @@
+# controle_chamados/indicadores.py — flags pré-calculadas na carga + cartões de KPI numa passada só
+import numpy as np
+import pandas as pd
+
+from .prazo import COL_SITUACAO_PRAZO, estruturar_prazo
+from .sla import ETAPAS_SLA, marcar_sla
+
+FLAG_NO_PRAZO = "_NO_PRAZO"
+FLAG_FORA_PRAZO = "_FORA_PRAZO"
+FLAG_AGUARDANDO_PROG = "_AGUARDANDO_PROG"
+
+# flag -> (coluna de origem, teste sobre o texto em minúsculas); PRAZO entra pela situação já interpretada
+REGRAS_FLAGS = {
+    FLAG_NO_PRAZO: (COL_SITUACAO_PRAZO, lambda s: s == "no prazo"),
+    FLAG_FORA_PRAZO: (COL_SITUACAO_PRAZO, lambda s: s == "fora do prazo"),
+    FLAG_AGUARDANDO_PROG: ("STATUS RESULT1", lambda s: s.str.contains("programa", regex=False)),
+}
+
+
+def _flag(serie: pd.Series, teste) -> np.ndarray:
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # testa cada categoria uma vez e espalha pelos códigos (nulos = False)
+        ok = teste(pd.Series(serie.cat.categories.astype(str)).str.lower()).to_numpy(dtype=bool)
+        codigos = serie.cat.codes.to_numpy()
+        return np.append(ok, False)[codigos]
+    return teste(serie.astype(str).str.lower()).fillna(False).to_numpy(dtype=bool)
+
+
+def marcar_flags(df: pd.DataFrame) -> pd.DataFrame:
+    # colunas "_" ficam fora da busca, da tabela e da exportação
+    flags = {nome: _flag(df[col], teste) for nome, (col, teste) in REGRAS_FLAGS.items() if col in df.columns}
+    return df.assign(**flags) if flags else df
+
+
+# registro dos indicadores: nome -> (colunas usadas, cálculo(n_linhas, arrays) -> valor)
+INDICADORES = {}
+
+
+def indicador(nome: str, colunas: list = ()):
+    def registrar(fn):
+        INDICADORES[nome] = (list(colunas), fn)
+        return fn
+    return registrar
+
+
+def calcular_indicadores(df: pd.DataFrame, nomes: list = None) -> dict:
+    # cada coluna necessária vira array uma vez só; indicador sem as colunas na base fica None
+    nomes = list(nomes or INDICADORES)
+    usadas = {c for n in nomes for c in INDICADORES[n][0]}
+    if (usadas - set(df.columns)) & REGRAS_FLAGS.keys():
+        # base montada fora da carga (sem marcar_flags): deriva as flags aqui
+        df = marcar_flags(df if COL_SITUACAO_PRAZO in df.columns else estruturar_prazo(df))
+    if (usadas - set(df.columns)) & ETAPAS_SLA.keys():
+        df = marcar_sla(df)
+    arrays = {c: df[c].to_numpy() for c in usadas if c in df.columns}
+    resultado = {}
+    for n in nomes:
+        colunas, calcular = INDICADORES[n]
+        resultado[n] = calcular(len(df), arrays) if all(c in arrays for c in colunas) else None
+    return resultado
+
+
+def _valores(a: np.ndarray) -> np.ndarray:
+    return np.asarray(a, dtype=float)
+
+
+@indicador("total")
+def _total(n, a):
+    return n
+
+
+@indicador("no_prazo", [FLAG_NO_PRAZO])
+def _no_prazo(n, a):
+    return int(a[FLAG_NO_PRAZO].sum())
+
+
+@indicador("fora_prazo", [FLAG_FORA_PRAZO])
+def _fora_prazo(n, a):
+    return int(a[FLAG_FORA_PRAZO].sum())
+
+
+@indicador("aguardando_programacao", [FLAG_AGUARDANDO_PROG])
+def _aguardando_programacao(n, a):
+    return int(a[FLAG_AGUARDANDO_PROG].sum())
+
+
+@indicador("valor_a_pagar", ["VALOR A PAGAR"])
+def _valor_a_pagar(n, a):
+    return float(np.nansum(_valores(a["VALOR A PAGAR"])))
+
+
+@indicador("valor_fora_prazo", ["VALOR A PAGAR", FLAG_FORA_PRAZO])
+def _valor_fora_prazo(n, a):
+    return float(np.nansum(_valores(a["VALOR A PAGAR"])[a[FLAG_FORA_PRAZO]]))
+
+
+@indicador("dias_ate_pagamento", ["_DIAS_TICKET_PGTO"])
+def _dias_ate_pagamento(n, a):
+    # média de dias entre a abertura do ticket e o pagamento no SAP (só linhas com as duas datas);
+    # mesma etapa do SLA: a abertura é a DATA CRIAÇÃO TICKET BR, ou a DATA CRIAÇÃO TICKET onde ela falta
+    dias = _valores(a["_DIAS_TICKET_PGTO"])
+    dias = dias[~np.isnan(dias)]
+    return float(dias.mean()) if len(dias) else None
@@ -0,0 +1,168 @@
+# controle_chamados/ingestao.py — leitura bruta da planilha (sem saneamento)
+import os, re, zipfile
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from .esquema import COLUNAS_SNAPSHOT
+from .snapshot import versao_arquivo
+
+NS_XLSX = {
+    "m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+ATTR_RID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+ERROS_EXCEL = {"#N/A", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#NULL!"}
+RE_DIMENSAO = re.compile(rb'<(?:\w+:)?dimension\s+ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"')
+
+
+def _numero_coluna(letras: str) -> int:
+    n = 0
+    for ch in letras:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+def _dimensao_xlsx(z: zipfile.ZipFile, parte: str):
+    # <dimension> fica no cabeçalho do XML da aba: lê só o começo, sem descer no sheetData
+    try:
+        with z.open(parte) as fh:
+            inicio = fh.read(1 << 14)
+    except KeyError:
+        return None
+    m = RE_DIMENSAO.search(inicio)
+    if not m:
+        return None
+    col_ini, lin_ini, col_fim, lin_fim = m.groups()
+    col_fim, lin_fim = col_fim or col_ini, lin_fim or lin_ini
+    return {
+        "linhas": int(lin_fim) - int(lin_ini) + 1,
+        "colunas": _numero_coluna(col_fim.decode()) - _numero_coluna(col_ini.decode()) + 1,
+    }
+
+
+def _manifesto_xlsx(caminho_excel: str) -> dict:
+    # xl/workbook.xml (nomes, na ordem das abas) + rels (arquivo de cada aba); nada de estilos ou sharedStrings
+    with zipfile.ZipFile(caminho_excel) as z:
+        livro = ET.fromstring(z.read("xl/workbook.xml"))
+        rels = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
+        alvos = {r.get("Id"): r.get("Target", "") for r in rels.findall("rel:Relationship", NS_XLSX)}
+        abas = {}
+        for aba in livro.iterfind("m:sheets/m:sheet", NS_XLSX):
+            alvo = alvos.get(aba.get(ATTR_RID), "")
+            parte = alvo.lstrip("/") if alvo.startswith("/") else f"xl/{alvo}"
+            abas[aba.get("name")] = _dimensao_xlsx(z, parte)
+    return abas
+
+
+@lru_cache(maxsize=16)
+def _manifesto(caminho_excel: str, versao: str) -> dict:
+    # aba -> {"linhas", "colunas"} (ou None), uma vez por versão do arquivo
+    if caminho_excel.lower().endswith(".xlsx"):
+        try:
+            return _manifesto_xlsx(caminho_excel)
+        except (KeyError, zipfile.BadZipFile, ET.ParseError):
+            pass  # pacote fora do padrão: o openpyxl resolve
+    if caminho_excel.lower().endswith((".xlsx", ".xls")):
+        with _abrir_pasta(caminho_excel) as xls:
+            return {nome: None for nome in xls.sheet_names}
+    return {"(arquivo CSV - sem abas)": None}
+
+
+def manifesto_excel(caminho_excel: str) -> dict:
+    if not os.path.exists(caminho_excel):
+        raise FileNotFoundError(f"Arquivo não encontrado: {caminho_excel}")
+    return _manifesto(caminho_excel, versao_arquivo(caminho_excel))
+
+
+def listar_abas_excel(caminho_excel: str) -> list:
+    return list(manifesto_excel(caminho_excel))
+
+
+def _abrir_pasta(caminho_excel: str) -> pd.ExcelFile:
+    # aberta só durante cada leitura (use com `with`): nenhum handle fica preso ao arquivo entre versões;
+    # o que se reaproveita é o resultado já lido (manifesto, cabeçalho, snapshot)
+    engine = "xlrd" if caminho_excel.lower().endswith(".xls") else "openpyxl"
+    return pd.ExcelFile(caminho_excel, engine=engine)
+
+
+@lru_cache(maxsize=32)
+def _cabecalho(caminho_excel: str, aba: str, versao: str) -> tuple:
+    if caminho_excel.lower().endswith((".xlsx", ".xls")):
+        with _abrir_pasta(caminho_excel) as xls:
+            colunas = pd.read_excel(xls, sheet_name=aba, nrows=0).columns
+    else:
+        colunas = pd.read_csv(caminho_excel, sep=";", encoding="utf-8", nrows=0).columns
+    return tuple(str(c).strip().upper() for c in colunas)
+
+
+def cabecalho_aba(caminho_excel: str, aba: str) -> list:
+    # linha de cabeçalho já em UPPER (mesma regra de ler_planilha), sem ler as linhas de dados
+    return list(_cabecalho(caminho_excel, aba, versao_arquivo(caminho_excel)))
+
+
+def _valor_celula(v):
+    # mesma conversão do leitor openpyxl do pandas: vazio -> "", número inteiro -> int, erro -> NaN
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    if isinstance(v, str) and v in ERROS_EXCEL:
+        return np.nan
+    return v
+
+
+def _ler_aba_streaming(ws, colunas: list) -> pd.DataFrame:
+    # openpyxl read-only: só as colunas pedidas; linhas vazias nelas (lixo de formatação) são puladas no fluxo
+    cabecalho = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+    posicoes = {}
+    for i, c in enumerate(cabecalho):
+        nome = "" if c is None else str(c).strip().upper()
+        if nome in colunas and nome not in posicoes:  # nome repetido: vale o primeiro, como no pandas
+            posicoes[nome] = i
+    nomes, idx = list(posicoes), list(posicoes.values())
+    if not idx:
+        return pd.DataFrame(columns=pd.Index(nomes, dtype=str))
+    dados = [nomes]
+    pendente = pulou = False
+    for linha in ws.iter_rows(min_row=2, values_only=True):
+        valores = [_valor_celula(linha[i] if i < len(linha) else None) for i in idx]
+        if any(v != "" and v is not np.nan for v in valores):
+            dados.append(valores)
+        else:
+            pendente = True
+        # linha pulada só conta se tiver algo depois (o read_excel corta as vazias do fim da aba)
+        if pendente and any(v is not None for v in linha):
+            pulou = True
+    # mesmo parser que o pd.read_excel usa por baixo: inferência de tipos e NAs idênticas; uma linha vazia
+    # representa as puladas (no read_excel elas viram NaN e, ex., uma coluna de inteiros sai float)
+    if pulou:
+        dados.append([""] * len(nomes))
+    df = TextParser(dados, header=0, skip_blank_lines=False).read()
+    return df.iloc[:-1] if pulou else df
+
+
+def ler_planilha(caminho_excel: str, aba: str, colunas: list = None, streaming: bool = True) -> pd.DataFrame:
+    # colunas: cabeçalhos (UPPER) a manter, padrão COLUNAS_SNAPSHOT; streaming=False é a leitura
+    # antiga (pd.read_excel com todas as colunas), mantida para comparação no benchmark
+    colunas = COLUNAS_SNAPSHOT if colunas is None else colunas
+    if caminho_excel.lower().endswith((".xlsx", ".xls")):
+        abas = listar_abas_excel(caminho_excel)
+        if aba not in abas:
+            raise ValueError(f"Aba '{aba}' não encontrada. Abas disponíveis: {abas}")
+        with _abrir_pasta(caminho_excel) as xls:
+            if streaming and caminho_excel.lower().endswith(".xlsx"):
+                return _ler_aba_streaming(xls.book[aba], colunas)
+            df = pd.read_excel(xls, sheet_name=aba)
+    elif streaming:
+        df = pd.read_csv(caminho_excel, sep=";", encoding="utf-8", usecols=lambda c: str(c).strip().upper() in colunas)
+        df = df.dropna(how="all").reset_index(drop=True)
+    else:
+        df = pd.read_csv(caminho_excel, sep=";", encoding="utf-8")
+
+    # cabeçalhos em UPPER
+    df.columns = [str(c).strip().upper() for c in df.columns]
+    return df
@@ -0,0 +1,95 @@
+# controle_chamados/memoria.py — cache LRU em memória, limitado pelo tamanho (bytes) das entradas
+import sys, threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def tamanho_bytes(obj) -> int:
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    return sys.getsizeof(obj)
+
+
+def ativar_copy_on_write() -> None:
+    # chamado pelos apps na partida: a base carregada é um objeto único compartilhado entre as sessões e, com
+    # copy-on-write, nenhuma sessão altera sem querer a base que as outras estão lendo (padrão no pandas 3)
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+class CacheLRU:
+    # entradas mais antigas saem quando a soma passa do limite (a recém-gerada e as de `manter` sempre ficam)
+
+    def __init__(self, limite_bytes: int):
+        self.limite_bytes = limite_bytes
+        self.total_bytes = 0
+        self.acertos = 0
+        self.faltas = 0
+        self._itens = OrderedDict()  # chave -> (valor, bytes)
+        self._lock = threading.Lock()
+        self._gerando = {}  # chave -> Lock: sessões simultâneas geram a mesma entrada uma vez só
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def _buscar(self, chave):
+        with self._lock:
+            if chave not in self._itens:
+                return False, None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return True, self._itens[chave][0]
+
+    def obter(self, chave, gerar, manter=()):
+        # manter: chaves que não saem para abrir espaço para esta (ex.: a base de onde o recorte sai)
+        achou, valor = self._buscar(chave)
+        if achou:
+            return valor
+        with self._lock:
+            trava = self._gerando.setdefault(chave, threading.Lock())
+        with trava:
+            achou, valor = self._buscar(chave)
+            if achou:
+                return valor
+            try:
+                valor = gerar()
+            finally:
+                with self._lock:
+                    self._gerando.pop(chave, None)
+            self.guardar(chave, valor, manter)
+            return valor
+
+    def guardar(self, chave, valor, manter=()) -> None:
+        tamanho = tamanho_bytes(valor)
+        with self._lock:
+            if chave in self._itens:
+                self.total_bytes -= self._itens.pop(chave)[1]
+            self._itens[chave] = (valor, tamanho)
+            self.total_bytes += tamanho
+            self.faltas += 1
+            fixas = {chave, *manter}
+            for k in [k for k in self._itens if k not in fixas]:
+                if self.total_bytes <= self.limite_bytes:
+                    break
+                self.total_bytes -= self._itens.pop(k)[1]
+
+    def descartar(self, condicao) -> int:
+        # remove as entradas cuja chave satisfaz condicao(chave); devolve quantas saíram
+        with self._lock:
+            chaves = [k for k in self._itens if condicao(k)]
+            for k in chaves:
+                self.total_bytes -= self._itens.pop(k)[1]
+        return len(chaves)
+
+    def resumo(self) -> dict:
+        with self._lock:
+            return {
+                "entradas": len(self._itens), "bytes": self.total_bytes, "limite_bytes": self.limite_bytes,
+                "acertos": self.acertos, "faltas": self.faltas,
+            }
@@ -0,0 +1,94 @@
+# controle_chamados/moeda.py — conversão de valores em R$ (escalar e vetorizada)
+import re
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_VALOR = ["VALOR RC", "VALOR A PAGAR", "VALOR BI"]
+
+# número já limpo que o float() aceita direto (sem expoente, sem dígitos não ASCII)
+_NUMERO_LIMPO = r"^-?(?:[0-9]+\.?[0-9]*|\.[0-9]+)$"
+
+
+def to_numeric_safe(x) -> float:
+    try:
+        s = str(x).strip()
+        if s == "" or s.lower() in {"nan", "none"}:
+            return float("nan")
+        s = re.sub(r"[^\d\.,\-]", "", s)
+        if "," in s and "." in s:
+            s = s.replace(".", "").replace(",", ".")
+        elif "," in s and "." not in s:
+            s = s.replace(",", ".")
+        return float(s)
+    except Exception:
+        return float("nan")
+
+
+def converter_moeda_serie(serie: pd.Series) -> pd.Series:
+    # mesma regra do to_numeric_safe, mas com operações de string do pandas
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        return serie.astype("float64")  # coluna já convertida na carga
+
+    original = serie.astype(object)
+    s = original.astype(str).str.strip()
+    vazio = (s.eq("") | s.str.lower().isin(["nan", "none"])).to_numpy(dtype=bool)
+    res = np.full(len(s), np.nan, dtype="float64")
+
+    # caminho rápido: texto que já é um número simples ("48500", "17339.93")
+    limpo = s.str.match(_NUMERO_LIMPO).to_numpy(dtype=bool) & ~vazio
+    res[limpo] = s[limpo].astype("float64").to_numpy()
+
+    # demais: tira R$, espaços e separadores de milhar como no escalar;
+    # texto com caractere não ASCII (ex.: dígitos unicode) fica para o escalar
+    sujo = np.flatnonzero(~limpo & ~vazio)
+    if len(sujo):
+        t = s.iloc[sujo]
+        ascii_ = ~t.str.contains(r"[^\x00-\x7f]", regex=True).to_numpy(dtype=bool)
+        sujo, t = sujo[ascii_], t[ascii_]
+        t = t.str.replace(r"[^\d\.,\-]", "", regex=True)
+        tem_virgula = t.str.contains(",", regex=False)
+        tem_ponto = t.str.contains(".", regex=False)
+        t = t.mask(tem_virgula & tem_ponto, t.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+        t = t.mask(tem_virgula & ~tem_ponto, t.str.replace(",", ".", regex=False))
+        ok = t.str.match(_NUMERO_LIMPO).to_numpy(dtype=bool)
+        res[sujo[ok]] = t[ok].astype("float64").to_numpy()
+
+    # casos raros seguem pelo caminho escalar de referência
+    resto = np.flatnonzero(~limpo & ~vazio & np.isnan(res))
+    if len(resto):
+        res[resto] = [to_numeric_safe(x) for x in original.iloc[resto]]
+    return pd.Series(res, index=serie.index, name=serie.name)
+
+
+def converter_colunas_moeda(df: pd.DataFrame, cols: list = None) -> pd.DataFrame:
+    f = df.copy(deep=False)
+    for c in (cols or COLUNAS_VALOR):
+        if c in f.columns:
+            f[c] = converter_moeda_serie(f[c])
+    return f
+
+
+def formatar_moeda_val(x) -> str:
+    try:
+        val = float(x) if isinstance(x, (int, float)) else to_numeric_safe(x)
+        if pd.notna(val):
+            s = f"R${val:,.2f}"
+            return s.replace(",", "X").replace(".", ",").replace("X", ".")
+        return ""
+    except Exception:
+        return ""
+
+
+def formatar_moeda_df(df: pd.DataFrame, cols: list) -> pd.DataFrame:
+    f = df.copy(deep=False)
+    for c in cols:
+        if c in f.columns:
+            f[c] = f[c].apply(formatar_moeda_val)
+    return f
+
+
+def estilo_moeda(df: pd.DataFrame, cols: list = None):
+    # R$ aplicado só na exibição (Styler): as colunas seguem float e o grid ordena por valor
+    presentes = [c for c in (cols or COLUNAS_VALOR) if c in df.columns]
+    return df.style.format("R${:,.2f}", subset=presentes, thousands=".", decimal=",", na_rep="")
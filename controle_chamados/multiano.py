@@ -0,0 +1,53 @@
+# controle_chamados/multiano.py — consolidação dos arquivos anuais (BASE ..._2025.xlsx, _2026.xlsx)
+import glob, os, re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .esquema import aplicar_esquema
+from .ingestao import ler_planilha
+
+COLUNA_ANO = "ANO"
+
+
+def descobrir_arquivos_anuais(caminho_base: str) -> dict:
+    # "BASE CONTROLE DE PAGAMENTOS.xlsx" -> {2025: "..._2025.xlsx", 2026: "..._2026.xlsx"}
+    pasta, nome = os.path.split(caminho_base)
+    raiz, ext = os.path.splitext(nome)
+    padrao = re.compile(rf"^{re.escape(raiz)}_(\d{{4}}){re.escape(ext)}$", re.IGNORECASE)
+    arquivos = {}
+    for caminho in glob.glob(os.path.join(glob.escape(pasta) if pasta else "", f"{glob.escape(raiz)}_*{ext}")):
+        m = padrao.match(os.path.basename(caminho))
+        if m:
+            arquivos[int(m.group(1))] = caminho
+    return dict(sorted(arquivos.items()))
+
+
+def ler_planilhas_paralelo(arquivos: dict, aba: str, max_workers: int = None) -> dict:
+    # cada ano é lido (openpyxl) em um processo separado; devolve {ano: DataFrame bruto}
+    if not arquivos:
+        return {}
+    if len(arquivos) == 1:
+        ano, caminho = next(iter(arquivos.items()))
+        return {ano: ler_planilha(caminho, aba)}
+    workers = max_workers or min(len(arquivos), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = {ano: pool.submit(ler_planilha, caminho, aba) for ano, caminho in arquivos.items()}
+        return {ano: fut.result() for ano, fut in futuros.items()}
+
+
+def validar_esquema(bases: dict, colunas: list) -> None:
+    presentes = {ano: {c for c in colunas if c in df.columns} for ano, df in bases.items()}
+    referencia = set().union(*presentes.values()) if presentes else set()
+    faltando = {ano: sorted(referencia - cols) for ano, cols in presentes.items() if referencia - cols}
+    if faltando:
+        detalhe = "; ".join(f"{ano} sem {cols}" for ano, cols in faltando.items())
+        raise ValueError(f"Arquivos anuais com schema diferente: {detalhe}")
+
+
+def consolidar_anos(bases: dict) -> pd.DataFrame:
+    partes = [df.assign(**{COLUNA_ANO: ano}) for ano, df in sorted(bases.items())]
+    if not partes:
+        return pd.DataFrame()
+    # cada ano tem suas próprias categorias; o concat as desfaz, então o esquema é reaplicado
+    return aplicar_esquema(pd.concat(partes, ignore_index=True))
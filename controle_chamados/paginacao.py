@@ -0,0 +1,38 @@
+# controle_chamados/paginacao.py — ordem pré-calculada da tabela detalhada e recorte por página
+import math
+
+import numpy as np
+import pandas as pd
+
+# mesma prioridade da tabela detalhada: a primeira coluna de data presente define a ordem
+COLUNAS_ORDEM = ["DATA_PGTO_SAP", "DATA CRIAÇÃO TICKET"]
+TAMANHOS_PAGINA = [50, 100, 250, 500, 1000]
+
+
+def ordem_base(df: pd.DataFrame, colunas: list = None) -> np.ndarray:
+    # posições da base em ordem crescente (nulos no fim); calculada uma vez por versão da base
+    for c in colunas or COLUNAS_ORDEM:
+        if c in df.columns:
+            chave = pd.to_datetime(df[c], errors="coerce")
+            return np.lexsort((np.arange(len(df)), chave.to_numpy(), chave.isna().to_numpy()))
+    return np.arange(len(df))
+
+
+def ordem_filtrada(ordem: np.ndarray, df: pd.DataFrame, filtrado: pd.DataFrame) -> np.ndarray:
+    # restringe a ordem pronta às linhas filtradas sem ordenar de novo (marcação O(n))
+    if filtrado is df or len(filtrado) == len(df):
+        return ordem
+    marca = np.zeros(len(df), dtype=bool)
+    marca[df.index.get_indexer(filtrado.index)] = True
+    return ordem[marca[ordem]]
+
+
+def total_paginas(total: int, tamanho: int) -> int:
+    return max(1, math.ceil(total / tamanho))
+
+
+def pagina(df: pd.DataFrame, ordem: np.ndarray, numero: int, tamanho: int, colunas: list = None) -> pd.DataFrame:
+    # só as linhas da página saem da base (numero começa em 1)
+    ini = (max(1, numero) - 1) * tamanho
+    f = df.iloc[ordem[ini:ini + tamanho]]
+    return f[colunas] if colunas is not None else f
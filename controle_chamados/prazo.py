@@ -0,0 +1,49 @@
+# controle_chamados/prazo.py — PRAZO interpretado uma vez na carga: situação (enum) + dias de atraso
+import re
+
+import numpy as np
+import pandas as pd
+
+COL_SITUACAO_PRAZO = "_SITUACAO_PRAZO"
+COL_DIAS_ATRASO = "_DIAS_ATRASO"
+
+# categorias fixas, nesta ordem (códigos estáveis); texto fora do padrão vira OUTRO, PRAZO vazio fica nulo
+SITUACOES_PRAZO = ["NO PRAZO", "FORA DO PRAZO", "PAGAMENTO EFETIVADO", "OUTRO"]
+
+# "no prazo" / "fora do prazo (13 dias)" / "pagamento efetivado"
+RE_PRAZO = re.compile(r"^(no prazo|fora do prazo|pagamento efetivado)\b\D*(\d+)?")
+
+
+def interpretar_prazo(texto: str) -> tuple:
+    # (situação, dias de atraso ou None); só "fora do prazo" carrega dias
+    m = RE_PRAZO.match(str(texto).strip().lower())
+    if not m:
+        return "OUTRO", None
+    situacao = m.group(1).upper()
+    dias = int(m.group(2)) if situacao == "FORA DO PRAZO" and m.group(2) else None
+    return situacao, dias
+
+
+def estruturar_prazo(df: pd.DataFrame) -> pd.DataFrame:
+    if "PRAZO" not in df.columns:
+        return df
+    # interpreta cada valor distinto uma vez e espalha pelos códigos (-1 = PRAZO vazio, pega o último: nulo)
+    cat = pd.Categorical(df["PRAZO"])
+    lidos = [interpretar_prazo(v) for v in cat.categories]
+    ids = np.array([SITUACOES_PRAZO.index(s) for s, _ in lidos] + [-1], dtype=np.int8)
+    dias = pd.array([d for _, d in lidos] + [None], dtype="Int16")
+    codigos = cat.codes
+    return df.assign(**{
+        COL_SITUACAO_PRAZO: pd.Categorical.from_codes(ids[codigos], categories=SITUACOES_PRAZO),
+        COL_DIAS_ATRASO: pd.Series(dias.take(codigos), index=df.index),
+    })
+
+
+def histograma_atraso(df: pd.DataFrame) -> pd.DataFrame:
+    # quantidade de tickets por dias de atraso (só as linhas fora do prazo com dias informados)
+    if COL_DIAS_ATRASO not in df.columns:
+        return pd.DataFrame(columns=["DIAS DE ATRASO", "QTD_TICKETS"])
+    dias = df[COL_DIAS_ATRASO].dropna().to_numpy(dtype=np.int64)
+    contagem = np.bincount(dias) if len(dias) else np.empty(0, dtype=np.int64)
+    presentes = np.flatnonzero(contagem)
+    return pd.DataFrame({"DIAS DE ATRASO": presentes, "QTD_TICKETS": contagem[presentes]})
@@ -0,0 +1,221 @@
+# controle_chamados/relatorios.py — relatórios em lote sem o Streamlit: agregados + extratos por preset de filtros
+#   python -m controle_chamados.relatorios --saida relatorios/2026-10
+#   python -m controle_chamados.relatorios --presets presets.json --por COORDENADOR --formatos CSV XLSX
+#   python -m controle_chamados.relatorios --banco base.sqlite   (base grande: filtros e agregados em SQL)
+# a planilha é lida e saneada uma vez; os presets rodam em paralelo (um processo por núcleo)
+import argparse, json, os, re, sys, time, unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from .banco import BaseSQL
+from .busca import IndiceBusca
+from .consulta import FILTROS_VAZIOS, agregar, aplicar_filtros
+from .delta import MONITOR
+from .esquema import COLUNAS_BASE
+from .exportacao import FORMATOS_EXPORTACAO, exportar
+from .filtros import ARGS_SELECAO, MotorFiltros
+from .multiano import COLUNA_ANO
+from .paginacao import ordem_base, ordem_filtrada
+from .saneamento import EXIGIR_PADRAO, obter_base
+
+PLANILHA_PADRAO = "BASE CONTROLE DE PAGAMENTOS.xlsx"
+ABA_PADRAO = "SOLICITAÇÃO DE PAGAMENTO"
+EIXOS_RELATORIO = ["MÊS", "PROJETO", "COORDENADOR"]
+DIMENSOES_POR = ["COORDENADOR", "FORNECEDOR", "PROJETO"]
+
+# preset = filtros (argumentos de aplicar_filtros) + o que gerar; opções ausentes ficam com o padrão
+OPCOES_PRESET = {
+    "filtros": {}, "eixos": EIXOS_RELATORIO, "ref_data_col": "DATA_PGTO_SAP", "excluir_nulos_eixo": True, "extrato": True,
+}
+PRESETS_PADRAO = {
+    "geral": {},
+    "fora_do_prazo": {"filtros": {"situacao_prazo_sel": ["FORA DO PRAZO"]}},
+    "atraso_mais_10_dias": {"filtros": {"atraso_faixa": [11, None]}},
+}
+
+
+def nome_arquivo(texto: str) -> str:
+    # "MÊS" -> "mes", "GM ENGENHARIA" -> "gm_engenharia"
+    ascii_ = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "_", ascii_.lower()).strip("_") or "vazio"
+
+
+def normalizar_preset(nome: str, preset: dict) -> dict:
+    desconhecidas = set(preset) - set(OPCOES_PRESET)
+    if desconhecidas:
+        raise ValueError(f"Preset '{nome}': opções desconhecidas {sorted(desconhecidas)}. Use {sorted(OPCOES_PRESET)}.")
+    p = {**OPCOES_PRESET, **preset}
+    filtros_invalidos = set(p["filtros"]) - set(FILTROS_VAZIOS)
+    if filtros_invalidos:
+        raise ValueError(f"Preset '{nome}': filtros desconhecidos {sorted(filtros_invalidos)}. Use {sorted(FILTROS_VAZIOS)}.")
+    eixos_invalidos = set(p["eixos"]) - set(EIXOS_RELATORIO)
+    if eixos_invalidos:
+        raise ValueError(f"Preset '{nome}': eixos inválidos {sorted(eixos_invalidos)}. Use {EIXOS_RELATORIO}.")
+    faixa = p["filtros"].get("atraso_faixa")
+    return {**p, "filtros": {**FILTROS_VAZIOS, **p["filtros"], "atraso_faixa": tuple(faixa) if faixa else None}}
+
+
+def expandir_por(presets: dict, coluna: str, todos: list) -> dict:
+    # um preset por valor da coluna (ex.: um relatório por coordenador); se o preset já escolhe valores, só esses
+    arg = next(k for k, c in ARGS_SELECAO.items() if c == coluna)
+    expandidos = {}
+    for nome, p in presets.items():
+        for v in p["filtros"][arg] or todos:
+            expandidos[f"{nome}_{nome_arquivo(v)}"] = {**p, "filtros": {**p["filtros"], arg: [v]}}
+    return expandidos
+
+
+# estado de cada processo de trabalho: a base chega uma vez (initargs) e os índices são montados ali;
+# com o banco, cada processo só abre a sua conexão e a base não passa pela memória
+_BASE = {}
+
+
+def _iniciar_trabalhador(df: pd.DataFrame) -> None:
+    _BASE.clear()
+    _BASE.update(df=df, motor=MotorFiltros(df), ordem=ordem_base(df))
+
+
+def _iniciar_trabalhador_banco(caminho: str) -> None:
+    _BASE.clear()
+    _BASE.update(banco=BaseSQL(caminho))
+
+
+def _tabelas_banco(preset: dict) -> dict:
+    banco, filtros = _BASE["banco"], preset["filtros"]
+    tabelas = {
+        f"por_{nome_arquivo(eixo)}": banco.agregar(filtros, eixo, preset["ref_data_col"] if eixo == "MÊS" else None, preset["excluir_nulos_eixo"])
+        for eixo in preset["eixos"]
+    }
+    if preset["extrato"]:
+        tabelas["extrato"] = banco.filtrar(filtros, [COLUNA_ANO] + COLUNAS_BASE)
+    return tabelas
+
+
+def _tabelas_df(preset: dict) -> dict:
+    df, filtros = _BASE["df"], preset["filtros"]
+    indice = None
+    if filtros["busca_texto"]:
+        if "indice" not in _BASE:
+            _BASE["indice"] = IndiceBusca(df)
+        indice = _BASE["indice"]
+    filtrado = aplicar_filtros(df, **filtros, indice_busca=indice, motor=_BASE["motor"])
+
+    tabelas = {
+        f"por_{nome_arquivo(eixo)}": agregar(filtrado, eixo, preset["ref_data_col"] if eixo == "MÊS" else None, preset["excluir_nulos_eixo"])
+        for eixo in preset["eixos"]
+    }
+    if preset["extrato"]:
+        # mesmas colunas e ordem do download da tabela detalhada
+        cols = [c for c in [COLUNA_ANO] + COLUNAS_BASE if c in filtrado.columns]
+        tabelas["extrato"] = df.iloc[ordem_filtrada(_BASE["ordem"], df, filtrado)][cols]
+    return tabelas
+
+
+def gerar_preset(nome: str, preset: dict, pasta: str, formatos: list) -> list:
+    # grava os arquivos do preset em pasta/<nome>/ e devolve [(caminho, linhas)]
+    tabelas = _tabelas_banco(preset) if "banco" in _BASE else _tabelas_df(preset)
+    destino = os.path.join(pasta, nome)
+    os.makedirs(destino, exist_ok=True)
+    gerados = []
+    for parte, tabela in tabelas.items():
+        for formato in formatos:
+            caminho = os.path.join(destino, f"{nome}_{parte}.{FORMATOS_EXPORTACAO[formato][0]}")
+            with open(caminho, "wb") as fh:
+                fh.write(exportar(tabela, formato))
+            gerados.append((caminho, len(tabela)))
+    return gerados
+
+
+def rodar_lote(df: pd.DataFrame, presets: dict, pasta: str, formatos: list, processos: int = None, banco: str = None):
+    # gerador de (nome, arquivos gerados ou exceção), na ordem em que os presets terminam; banco = arquivo SQLite no lugar de df
+    # núcleos de fato disponíveis ao processo (respeita a afinidade de CPU de containers)
+    disponiveis = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    processos = max(1, min(processos or disponiveis or 1, len(presets)))
+    iniciar, argumentos = (_iniciar_trabalhador_banco, (banco,)) if banco else (_iniciar_trabalhador, (df,))
+    if processos == 1:
+        iniciar(*argumentos)
+        for nome, p in presets.items():
+            try:
+                yield nome, gerar_preset(nome, p, pasta, formatos)
+            except Exception as e:
+                yield nome, e
+        return
+    with ProcessPoolExecutor(max_workers=processos, initializer=iniciar, initargs=argumentos) as pool:
+        futuros = {pool.submit(gerar_preset, nome, p, pasta, formatos): nome for nome, p in presets.items()}
+        for futuro in as_completed(futuros):
+            try:
+                yield futuros[futuro], futuro.result()
+            except Exception as e:
+                yield futuros[futuro], e
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Relatórios em lote (agregados por MÊS/PROJETO/COORDENADOR e extratos filtrados) sem abrir o app.")
+    parser.add_argument("--planilha", default=PLANILHA_PADRAO)
+    parser.add_argument("--aba", default=ABA_PADRAO)
+    parser.add_argument("--presets", default=None,
+                        help='JSON {"nome": {"filtros": {...argumentos de aplicar_filtros}, "eixos": [...], "extrato": true}} (padrão: presets embutidos)')
+    parser.add_argument("--apenas", nargs="+", default=None, help="roda só estes presets")
+    parser.add_argument("--por", choices=DIMENSOES_POR, default=None, help="um relatório por valor desta coluna, para cada preset")
+    parser.add_argument("--formatos", nargs="+", choices=list(FORMATOS_EXPORTACAO), default=["CSV"])
+    parser.add_argument("--exigir", nargs="*", default=EXIGIR_PADRAO, help="ao menos um destes campos preenchido (saneamento do app)")
+    parser.add_argument("--saida", default=None, help="pasta dos arquivos (padrão: relatorios/<AAAA-MM>)")
+    parser.add_argument("--processos", type=int, default=None, help="padrão: número de núcleos")
+    parser.add_argument("--banco", default=None,
+                        help="arquivo SQLite com a base saneada e indexada (criado/atualizado se a planilha mudou); filtros e agregados rodam em SQL")
+    args = parser.parse_args(argv)
+
+    if args.presets:
+        with open(args.presets, encoding="utf-8") as fh:
+            brutos = json.load(fh)
+    else:
+        brutos = PRESETS_PADRAO
+    if args.apenas:
+        faltando = set(args.apenas) - set(brutos)
+        if faltando:
+            parser.error(f"presets inexistentes: {sorted(faltando)}")
+        brutos = {n: brutos[n] for n in args.apenas}
+    try:
+        presets = {nome: normalizar_preset(nome, p) for nome, p in brutos.items()}
+    except ValueError as e:
+        parser.error(str(e))
+
+    t0 = time.perf_counter()
+    df = None
+    if args.banco:
+        # mesma planilha, aba e saneamento da última carga: reaproveita o banco sem abrir o Excel
+        identificacao = {"planilha": os.path.abspath(args.planilha), "versao": MONITOR.verificar(args.planilha)[0],
+                         "aba": args.aba, "exigir": sorted(args.exigir)}
+        banco = BaseSQL(args.banco)
+        situacao = "reaproveitado"
+        if not banco.atualizado(identificacao):
+            banco.carregar(obter_base(args.planilha, args.aba, args.exigir, True), identificacao)
+            situacao = "carregado"
+        print(f"Banco {args.banco} {situacao}: {banco.total_linhas()} linhas ({time.perf_counter() - t0:.1f}s)", flush=True)
+        todos = banco.valores(args.por) if args.por else None
+        banco.fechar()
+    else:
+        df = obter_base(args.planilha, args.aba, args.exigir, True)
+        print(f"Base: {len(df)} linhas de {args.planilha} / {args.aba} ({time.perf_counter() - t0:.1f}s)", flush=True)
+        todos = sorted(df[args.por].dropna().unique().tolist()) if args.por else None
+    if args.por:
+        presets = expandir_por(presets, args.por, todos)
+
+    pasta = args.saida or os.path.join("relatorios", f"{datetime.now():%Y-%m}")
+    erros = 0
+    for nome, resultado in rodar_lote(df, presets, pasta, args.formatos, args.processos, args.banco):
+        if isinstance(resultado, Exception):
+            erros += 1
+            print(f"  ERRO {nome}: {resultado}", file=sys.stderr, flush=True)
+            continue
+        linhas = next((n for caminho, n in resultado if "_extrato." in caminho), None)
+        detalhe = f"{linhas} linhas no extrato" if linhas is not None else "sem extrato"
+        print(f"  {nome:<40} {len(resultado):>3} arquivos · {detalhe}", flush=True)
+    print(f"\n{len(presets) - erros}/{len(presets)} presets em {pasta} ({time.perf_counter() - t0:.1f}s)")
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
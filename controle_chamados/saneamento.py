@@ -0,0 +1,176 @@
+# controle_chamados/saneamento.py — leitura + saneamento da base, sem dependência de Streamlit
+import os
+
+import pandas as pd
+
+from .delta import COL_CHAVE, MONITOR, aplicar_delta, calcular_delta, gravar_com_linhas, impressao_linhas, snapshot_anterior
+from .esquema import CATEGORIAS_NORMALIZAR, COLUNAS_BASE, COLUNAS_CHAVE_VAZIAS, COLUNAS_DATA, COLUNAS_SNAPSHOT, aplicar_esquema
+from .indicadores import marcar_flags
+from .ingestao import ler_planilha
+from .memoria import CacheLRU
+from .moeda import COLUNAS_VALOR, converter_colunas_moeda
+from .prazo import estruturar_prazo
+from .sla import marcar_sla
+from .snapshot import chave_snapshot, ler_snapshot, podar_colunas, preparar_para_arrow
+
+# saneamento padrão dos apps: basta um destes campos preenchido para a linha contar
+EXIGIR_PADRAO = [c for c in ["FORNECEDOR", "COORDENADOR", "PROJETO", "PEDIDO", "NOTA"] if c in COLUNAS_CHAVE_VAZIAS]
+
+# bases em memória no processo, em dois níveis e com limite de tamanho (LRU):
+# ("saneada", arquivo, versão, aba) -> planilha saneada inteira; ("uteis", ..., exigir, drop) -> recorte de linhas úteis
+CACHE_BASES = CacheLRU(int(os.environ.get("CONTROLE_CHAMADOS_CACHE_MB", "512")) * 2**20)
+
+
+def limpar_vazios_texto(df: pd.DataFrame, cols: list) -> pd.DataFrame:
+    f = df.copy(deep=False)
+    for c in cols:
+        if c in f.columns:
+            f[c] = f[c].astype(str).str.strip()
+            f[c] = f[c].replace({"": pd.NA, "nan": pd.NA, "None": pd.NA, "NONE": pd.NA})
+    return f
+
+
+# normalização de categorias (UPPER + trim + colapsar espaços)
+def normalizar_categorias(df: pd.DataFrame, cols: list) -> pd.DataFrame:
+    f = df.copy(deep=False)
+    for c in cols:
+        if c in f.columns:
+            # manter NaN
+            mask_na = f[c].isna()
+            s = f[c].astype(str).str.strip()
+            s = s.str.replace(r"\s+", " ", regex=True)
+            s = s.str.upper()
+            s[mask_na] = pd.NA  # recoloca NaN onde era NaN
+            f[c] = s
+    return f
+
+
+def filtrar_linhas_uteis(df: pd.DataFrame, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool = True) -> pd.DataFrame:
+    f = df.copy(deep=False)
+    if aplicar_drop_all_empty:
+        chaves_presentes = [c for c in COLUNAS_CHAVE_VAZIAS if c in f.columns]
+        if chaves_presentes:
+            f = f.dropna(subset=chaves_presentes, how="all")
+    if exigir_qualquer_preenchido:
+        campos = [c for c in exigir_qualquer_preenchido if c in f.columns]
+        if campos:
+            mask = False
+            for c in campos:
+                mask = (mask | (f[c].notna()))
+            f = f[mask]
+    return f
+
+
+def chave_exigir(exigir_qualquer_preenchido) -> tuple:
+    # "ao menos um preenchido" não depende da ordem nem de repetição no multiselect
+    return tuple(sorted(set(exigir_qualquer_preenchido or [])))
+
+
+def opcoes_saneamento() -> dict:
+    # o snapshot guarda a planilha saneada sem o recorte de linhas úteis (feito em memória)
+    return {"normalizar": CATEGORIAS_NORMALIZAR}
+
+
+def recortar_uteis(saneada: pd.DataFrame, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool) -> pd.DataFrame:
+    df = filtrar_linhas_uteis(saneada, list(chave_exigir(exigir_qualquer_preenchido)), aplicar_drop_all_empty)
+    # categorias só das linhas que ficaram (como se o recorte tivesse vindo antes do esquema)
+    # (as colunas "_" derivadas têm categorias fixas e ficam como estão)
+    cats = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype) and not str(c).startswith("_")]
+    df = df.assign(**{c: df[c].cat.remove_unused_categories() for c in cats})
+    # flags dos indicadores calculadas uma vez por recorte, não a cada rerun
+    df = marcar_flags(df)
+    df.attrs = dict(saneada.attrs)
+    return df
+
+
+def converter_data(serie: pd.Series) -> pd.Series:
+    # formato e resolução fixos (ISO do openpyxl, senão dd/mm/aaaa; ns) em vez de inferidos pelo lote:
+    # a recarga incremental (só as linhas alteradas) lê as mesmas datas que a carga completa
+    iso = pd.to_datetime(serie, errors="coerce", format="ISO8601")
+    return iso.fillna(pd.to_datetime(serie, errors="coerce", format="%d/%m/%Y")).astype("datetime64[ns]")
+
+
+def sanear_base(df: pd.DataFrame) -> pd.DataFrame:
+    # saneamento de texto
+    df = limpar_vazios_texto(df, list(set(COLUNAS_CHAVE_VAZIAS + COLUNAS_BASE)))
+    # normalizar categorias (une 'HENRIQUE' e 'Henrique' etc.)
+    df = normalizar_categorias(df, CATEGORIAS_NORMALIZAR)
+
+    # datas
+    for c in COLUNAS_DATA:
+        if c in df.columns:
+            try:
+                df[c] = converter_data(df[c])
+            except Exception:
+                pass
+
+    # valores em R$ convertidos uma única vez para float64
+    df = converter_colunas_moeda(df, COLUNAS_VALOR)
+
+    # tipos compactos (category / Int32 / string / float64 / datetime64) numa passada só
+    return aplicar_esquema(preparar_para_arrow(podar_colunas(df, COLUNAS_SNAPSHOT)))
+
+
+def derivar_colunas(df: pd.DataFrame) -> pd.DataFrame:
+    # colunas "_" calculadas uma vez por versão (não vão para o snapshot): situação/dias de atraso do PRAZO,
+    # prazos entre as datas do ticket e código do mês de cada data
+    return marcar_sla(estruturar_prazo(df))
+
+
+def ler_base_saneada(caminho_excel: str, aba: str, bruto: pd.DataFrame = None) -> pd.DataFrame:
+    if not os.path.exists(caminho_excel):
+        raise FileNotFoundError(f"Arquivo não encontrado: {caminho_excel}")
+
+    # snapshot Parquet: o openpyxl só roda de novo quando o conteúdo da planilha muda
+    opcoes = opcoes_saneamento()
+    chave = chave_snapshot(caminho_excel, aba, opcoes)
+    df = ler_snapshot(chave, COLUNAS_SNAPSHOT)
+    if df is not None:
+        return derivar_colunas(df)
+
+    # bruto: planilha já lida (ex.: em paralelo pela visão multi-ano)
+    bruto = bruto if bruto is not None else ler_planilha(caminho_excel, aba)
+    linhas = impressao_linhas(bruto)
+
+    # planilha mudou: só as linhas inseridas/alteradas passam pelo saneamento, o resto vem do snapshot anterior
+    anterior = snapshot_anterior(caminho_excel, aba, opcoes, COLUNAS_SNAPSHOT)
+    if anterior is not None:
+        saneado_anterior, linhas_anteriores = anterior
+        delta = calcular_delta(linhas_anteriores, linhas)
+        novos = sanear_base(bruto[~delta["iguais"]])
+        # categorias de versões diferentes não se juntam no concat: reaplica o esquema no resultado
+        df = aplicar_esquema(aplicar_delta(saneado_anterior, linhas, delta, novos))
+        resumo = {k: delta[k] for k in ("inseridos", "atualizados", "removidos")}
+    else:
+        df = sanear_base(bruto)
+        df[COL_CHAVE] = linhas[COL_CHAVE].reindex(df.index)
+        resumo = None
+
+    gravar_com_linhas(df, linhas, chave, caminho_excel, aba, opcoes)
+    df = derivar_colunas(podar_colunas(df, COLUNAS_SNAPSHOT))
+    if resumo:
+        df.attrs["delta"] = resumo
+    return df
+
+
+def ler_base(caminho_excel: str, aba: str, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool, bruto: pd.DataFrame = None) -> pd.DataFrame:
+    return recortar_uteis(ler_base_saneada(caminho_excel, aba, bruto=bruto), exigir_qualquer_preenchido, aplicar_drop_all_empty)
+
+
+def obter_base(caminho_excel: str, aba: str, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool, versao: str = None, bruto: pd.DataFrame = None) -> pd.DataFrame:
+    # trocar as opções de saneamento só refaz o recorte; a planilha é lida uma vez por versão/aba
+    # o recorte é procurado primeiro: a planilha saneada só é pedida (e "usada" no LRU) quando ele falta
+    versao = versao or MONITOR.verificar(caminho_excel)[0]
+    chave_saneada = ("saneada", caminho_excel, versao, aba)
+    chave = ("uteis", caminho_excel, versao, aba, chave_exigir(exigir_qualquer_preenchido), bool(aplicar_drop_all_empty))
+
+    def recortar():
+        saneada = CACHE_BASES.obter(chave_saneada, lambda: ler_base_saneada(caminho_excel, aba, bruto=bruto))
+        return recortar_uteis(saneada, exigir_qualquer_preenchido, aplicar_drop_all_empty)
+
+    # a saneada não sai para dar lugar ao próprio recorte (com o limite apertado, um expulsava o outro a cada rerun)
+    return CACHE_BASES.obter(chave, recortar, manter=[chave_saneada])
+
+
+def descartar_versao(caminho_excel: str, versao: str) -> int:
+    return CACHE_BASES.descartar(lambda k: k[1] == caminho_excel and k[2] == versao)
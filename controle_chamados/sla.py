@@ -0,0 +1,71 @@
+# controle_chamados/sla.py — prazos entre as datas do ticket (em dias) e códigos de mês, calculados uma vez na carga
+import numpy as np
+import pandas as pd
+
+from .esquema import COLUNAS_DATA
+
+# abertura do ticket: a data BR é a preferida; sem ela, vale a data original
+DATAS_TICKET = ["DATA CRIAÇÃO TICKET BR", "DATA CRIAÇÃO TICKET"]
+
+# coluna derivada -> (rótulo, data inicial, data final); "TICKET" = DATAS_TICKET
+ETAPAS_SLA = {
+    "_DIAS_TICKET_RC": ("Ticket → RC", "TICKET", "DATA CRIAÇÃO RC"),
+    "_DIAS_RC_PGTO": ("RC → pagamento", "DATA CRIAÇÃO RC", "DATA_PGTO_SAP"),
+    "_DIAS_TICKET_PGTO": ("Ticket → pagamento", "TICKET", "DATA_PGTO_SAP"),
+}
+DIMENSOES_SLA = ["COORDENADOR", "FORNECEDOR", "PROJETO"]
+PERCENTIS_SLA = [50, 90, 99]
+
+
+def coluna_mes(coluna_data: str) -> str:
+    return f"_MES {coluna_data}"
+
+
+def codigo_mes(serie: pd.Series) -> np.ndarray:
+    # ano*12 + (mês-1); -1 para data vazia
+    datas = pd.to_datetime(serie, errors="coerce")
+    cod = (datas.dt.year * 12 + datas.dt.month - 1).fillna(-1)
+    return cod.to_numpy(dtype=np.int32)
+
+
+def rotulo_mes(cod: int):
+    return f"{cod // 12:04d}-{cod % 12 + 1:02d}" if cod >= 0 else np.nan
+
+
+def _datas(df: pd.DataFrame, nome: str):
+    if nome != "TICKET":
+        return df[nome] if nome in df.columns else None
+    presentes = [df[c] for c in DATAS_TICKET if c in df.columns]
+    if not presentes:
+        return None
+    datas = presentes[0]
+    for outra in presentes[1:]:
+        datas = datas.fillna(outra)
+    return datas
+
+
+def marcar_sla(df: pd.DataFrame) -> pd.DataFrame:
+    novas = {coluna_mes(c): codigo_mes(df[c]) for c in COLUNAS_DATA if c in df.columns}
+    for coluna, (_, inicio, fim) in ETAPAS_SLA.items():
+        a, b = _datas(df, inicio), _datas(df, fim)
+        if a is not None and b is not None:
+            # float32: NaN onde falta uma das datas
+            novas[coluna] = ((b - a) / pd.Timedelta(days=1)).to_numpy(dtype=np.float32, na_value=np.nan)
+    return df.assign(**novas) if novas else df
+
+
+def percentis_sla(df: pd.DataFrame, dimensao: str, etapa: str, percentis: list = None) -> pd.DataFrame:
+    # p50/p90/p99 (dias) por valor da dimensão; só entram linhas com as duas datas da etapa
+    percentis = percentis or PERCENTIS_SLA
+    colunas = [dimensao, "QTD_TICKETS"] + [f"P{p}" for p in percentis]
+    if dimensao not in df.columns or etapa not in df.columns:
+        return pd.DataFrame(columns=colunas)
+    f = df[[dimensao, etapa]].dropna()
+    if f.empty:
+        return pd.DataFrame(columns=colunas)
+    grupos = f.groupby(dimensao, observed=True)[etapa]
+    agreg = grupos.quantile([p / 100 for p in percentis]).unstack()
+    agreg.columns = colunas[2:]
+    agreg.insert(0, "QTD_TICKETS", grupos.size())
+    ordem = "P90" if "P90" in agreg.columns else agreg.columns[-1]
+    return agreg.reset_index().sort_values(ordem, ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,89 @@
+# controle_chamados/snapshot.py — cache colunar (Parquet) da base já saneada
+import hashlib, json, os
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # sem pyarrow o app segue lendo direto do Excel
+    pq = None
+
+# Pasta dos snapshots (pode ser trocada por variável de ambiente no deploy)
+DIR_SNAPSHOT = os.environ.get("CONTROLE_CHAMADOS_CACHE", ".cache_base")
+
+# Incrementar quando o saneamento mudar, para invalidar snapshots antigos
+VERSAO_FORMATO = 8
+
+
+def hash_arquivo(caminho: str, bloco: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(caminho, "rb") as fh:
+        for parte in iter(lambda: fh.read(bloco), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def versao_arquivo(caminho: str) -> str:
+    # barata (só stat): serve de chave para estruturas derivadas da base em memória
+    st_ = os.stat(caminho)
+    return f"{st_.st_mtime_ns}-{st_.st_size}"
+
+
+def chave_snapshot(caminho_excel: str, aba: str, opcoes: dict) -> str:
+    ident = json.dumps(
+        {"hash": hash_arquivo(caminho_excel), "aba": aba, "opcoes": opcoes, "formato": VERSAO_FORMATO},
+        ensure_ascii=False, sort_keys=True, default=str,
+    )
+    return hashlib.sha256(ident.encode("utf-8")).hexdigest()[:32]
+
+
+def caminho_snapshot(chave: str) -> str:
+    return os.path.join(DIR_SNAPSHOT, f"{chave}.parquet")
+
+
+def podar_colunas(df: pd.DataFrame, colunas: list) -> pd.DataFrame:
+    return df[[c for c in colunas if c in df.columns]]
+
+
+def preparar_para_arrow(df: pd.DataFrame) -> pd.DataFrame:
+    # colunas object misturam int/str (ex.: NOTA, PEDIDO) e o Arrow exige um tipo só
+    f = df.copy(deep=False)
+    for c in f.columns:
+        if f[c].dtype == object:
+            f[c] = f[c].astype("string")
+    return f
+
+
+def existe_snapshot(chave: str) -> bool:
+    return pq is not None and os.path.exists(caminho_snapshot(chave))
+
+
+def ler_snapshot(chave: str, colunas: list):
+    if pq is None:
+        return None
+    caminho = caminho_snapshot(chave)
+    if not os.path.exists(caminho):
+        return None
+    try:
+        disponiveis = pq.read_schema(caminho).names
+        return pd.read_parquet(caminho, columns=[c for c in colunas if c in disponiveis])
+    except Exception:
+        return None
+
+
+def gravar_snapshot(df: pd.DataFrame, chave: str) -> bool:
+    if pq is None:
+        return False
+    destino = caminho_snapshot(chave)
+    tmp = f"{destino}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(DIR_SNAPSHOT, exist_ok=True)
+        df.to_parquet(tmp)
+        os.replace(tmp, destino)  # troca atômica: leitores nunca veem arquivo pela metade
+        return True
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
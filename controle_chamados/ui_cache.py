@@ -0,0 +1,182 @@
+# controle_chamados/ui_cache.py — caches do Streamlit, aquecimento e componentes comuns aos dois apps
+# (o único módulo do pacote que importa Streamlit; os apps guardam só o próprio layout)
+import pandas as pd
+import streamlit as st
+
+from .aquecimento import Aquecimento, importar_em_segundo_plano
+from .busca import IndiceBusca
+from .cubo import CuboAgregacao
+from .delta import MONITOR
+from .esquema import COLUNAS_BASE
+from .exportacao import exportar
+from .filtros import MotorFiltros, montar_selecoes, opcoes_filtros
+from .moeda import COLUNAS_VALOR, estilo_moeda
+from .multiano import consolidar_anos, ler_planilhas_paralelo, validar_esquema
+from .paginacao import ordem_base
+from .saneamento import EXIGIR_PADRAO, chave_exigir, descartar_versao, obter_base, opcoes_saneamento
+from .snapshot import chave_snapshot, existe_snapshot
+
+
+# uma única base imutável por versão da planilha, compartilhada por todas as sessões do processo
+# (sem cópia por sessão; com o copy-on-write do pandas, quem altera colunas altera só a própria visão)
+def carregar_base(caminho_excel: str, aba: str, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool, versao: str = None, _bruto: pd.DataFrame = None) -> pd.DataFrame:
+    # cache em dois níveis do pacote (CACHE_BASES, LRU por tamanho): a planilha saneada uma vez por versão/aba
+    # e o recorte de linhas úteis por opções; _bruto: planilha já lida (ex.: em paralelo pela visão multi-ano)
+    with st.spinner("Carregando a base…"):
+        return obter_base(caminho_excel, aba, exigir_qualquer_preenchido, aplicar_drop_all_empty, versao, bruto=_bruto)
+
+
+@st.cache_resource(show_spinner=True, max_entries=2)
+def carregar_base_multiano(arquivos: dict, aba: str, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool, versoes: dict = None) -> pd.DataFrame:
+    # só os anos sem snapshot passam pelo openpyxl (em paralelo); anos fechados vêm do Parquet
+    opcoes = opcoes_saneamento()
+    pendentes = {ano: arq for ano, arq in arquivos.items() if not existe_snapshot(chave_snapshot(arq, aba, opcoes))}
+    brutos = ler_planilhas_paralelo(pendentes, aba)
+    bases = {
+        ano: carregar_base(arq, aba, exigir_qualquer_preenchido, aplicar_drop_all_empty, (versoes or {}).get(ano), _bruto=brutos.get(ano))
+        for ano, arq in arquivos.items()
+    }
+    validar_esquema(bases, COLUNAS_BASE)
+    return consolidar_anos(bases)
+
+
+@st.cache_resource(show_spinner=False)
+def recursos_por_versao() -> dict:
+    # versão da planilha -> argumentos dos recursos montados para ela (todas as abas/opções), para descartar juntos
+    return {}
+
+
+def registrar_versao(caminho_excel: str, aba: str, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool, versao: str) -> None:
+    args = (caminho_excel, aba, exigir_qualquer_preenchido, aplicar_drop_all_empty, versao)
+    recursos_por_versao().setdefault(versao, {})[repr(args)] = args
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def indice_busca_base(caminho_excel: str, aba: str, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool, versao: str, _df: pd.DataFrame) -> IndiceBusca:
+    # construído uma vez por versão da base e compartilhado entre as sessões
+    registrar_versao(caminho_excel, aba, exigir_qualquer_preenchido, aplicar_drop_all_empty, versao)
+    return IndiceBusca(_df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def motor_filtros_base(caminho_excel: str, aba: str, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool, versao: str, _df: pd.DataFrame) -> MotorFiltros:
+    registrar_versao(caminho_excel, aba, exigir_qualquer_preenchido, aplicar_drop_all_empty, versao)
+    return MotorFiltros(_df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def opcoes_filtros_base(caminho_excel: str, aba: str, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool, versao: str, _df: pd.DataFrame) -> dict:
+    registrar_versao(caminho_excel, aba, exigir_qualquer_preenchido, aplicar_drop_all_empty, versao)
+    return opcoes_filtros(_df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def cubo_base(caminho_excel: str, aba: str, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool, versao: str, _df: pd.DataFrame) -> CuboAgregacao:
+    # soma/contagem por mês × dimensões; ordenar ou trocar de eixo não varre a base
+    registrar_versao(caminho_excel, aba, exigir_qualquer_preenchido, aplicar_drop_all_empty, versao)
+    return CuboAgregacao(_df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def ordem_base_cache(caminho_excel: str, aba: str, exigir_qualquer_preenchido: list, aplicar_drop_all_empty: bool, versao: str, _df: pd.DataFrame):
+    registrar_versao(caminho_excel, aba, exigir_qualquer_preenchido, aplicar_drop_all_empty, versao)
+    return ordem_base(_df)
+
+
+def invalidar_versao(caminho_excel: str, versao_antiga: str) -> None:
+    # a planilha mudou: descarta as entradas da versão anterior em todas as abas e opções de saneamento
+    # (a visão multi-ano leva a versão de cada ano na própria chave: "multiano:2025=...|2026=...")
+    descartar_versao(caminho_excel, versao_antiga)
+    registro = recursos_por_versao()
+    for versao in [v for v in list(registro) if versao_antiga in v]:
+        for args in registro.pop(versao, {}).values():
+            for fn in (indice_busca_base, motor_filtros_base, opcoes_filtros_base, cubo_base, ordem_base_cache):
+                try:
+                    fn.clear(*args, None)
+                except TypeError:
+                    pass
+        if versao.startswith("multiano:"):
+            # poucas entradas (max_entries=2), remontadas a partir das bases por ano que seguem no CACHE_BASES
+            carregar_base_multiano.clear()
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def exportar_filtrado(assinatura: str, formato: str, _df: pd.DataFrame) -> bytes:
+    # bytes guardados por assinatura dos filtros: baixar de novo não serializa outra vez
+    return exportar(_df, formato)
+
+
+@st.cache_resource(show_spinner=False)
+def plotly_express():
+    # o import começa no primeiro run do processo, numa thread; só quem desenha gráfico espera por ele
+    return importar_em_segundo_plano("plotly.express")
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def figuras_agregado(assinatura: str, ordenar_por: str, tema: str, _agreg: pd.DataFrame, _montar) -> tuple:
+    # figuras por (conteúdo da agregação, métrica, tema): o mesmo recorte não remonta os gráficos;
+    # _montar(px, agreg, ordenar_por) -> (barras, pizza) é o visual de cada app
+    return _montar(plotly_express().result(), _agreg, ordenar_por)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def figura_atraso(assinatura: str, tema: str, _hist: pd.DataFrame, _montar):
+    return _montar(plotly_express().result(), _hist)
+
+
+@st.cache_resource(show_spinner=False)
+def aquecimento(caminho_excel: str, aba: str, refs_mes: tuple, excluir_nulos_mes: bool) -> Aquecimento:
+    # uma vez por processo (ex.: logo após o redeploy): aba padrão + saneamento padrão, opções dos filtros,
+    # MÊS sem filtros (na referência e no "excluir nulos" padrão do app) e a ordem da tabela ficam prontos
+    # nos mesmos caches que a UI consulta
+    def args(ctx):
+        return caminho_excel, aba, chave_exigir(EXIGIR_PADRAO), True, ctx["versao"], ctx["df"]
+
+    def ler(ctx):
+        ctx["versao"], _ = MONITOR.verificar(caminho_excel)
+        ctx["df"] = obter_base(caminho_excel, aba, EXIGIR_PADRAO, True, ctx["versao"])
+
+    def filtros(ctx):
+        motor_filtros_base(*args(ctx))
+        opcoes_filtros_base(*args(ctx))
+
+    def mes(ctx):
+        ref = next((c for c in refs_mes if c in ctx["df"].columns), None)
+        cubo_base(*args(ctx)).agregar("MÊS", ref, excluir_nulos_mes, selecoes=montar_selecoes([], [], [], [], [], [], []))
+
+    return Aquecimento([
+        ("lendo a planilha", ler),
+        ("montando os filtros", filtros),
+        ("agregando por mês", mes),
+        ("ordenando a tabela", lambda ctx: ordem_base_cache(*args(ctx))),
+    ]).iniciar()
+
+
+@st.fragment(run_every=0.5)
+def progresso_aquecimento(aquec: Aquecimento):
+    # só a barra roda de novo a cada meio segundo (o resto do script não); pronto o aquecimento, o app segue inteiro
+    if aquec.pronto.is_set():
+        st.rerun()
+    st.progress(aquec.progresso, text=f"Preparando a base ({aquec.etapa})…")
+
+
+def tabela_moeda(df: pd.DataFrame, **kwargs):
+    # R$ formatado só na exibição (as colunas seguem float e o grid ordena por valor);
+    # acima do limite de células do Styler, cai para o formato printf do próprio grid ("localized" só existe em versões novas)
+    if df.size <= pd.get_option("styler.render.max_elements"):
+        st.dataframe(estilo_moeda(df), **kwargs)
+    else:
+        config = {c: st.column_config.NumberColumn(c, format="R$ %.2f") for c in COLUNAS_VALOR if c in df.columns}
+        st.dataframe(df, column_config=config, **kwargs)
+
+
+def download_sob_demanda(label, gerar, file_name, mime, key):
+    # Streamlit recente aceita uma função em `data`: o arquivo só é gerado no clique
+    try:
+        st.download_button(label=label, data=gerar, file_name=file_name, mime=mime, key=key)
+    except Exception:
+        # versões antigas: gera só depois de pedir e mantém o botão nos próximos reruns
+        if st.button(f"Preparar arquivo ({label})", key=f"{key}_preparar"):
+            st.session_state[f"{key}_pronto"] = True
+        if st.session_state.get(f"{key}_pronto"):
+            st.download_button(label=label, data=gerar(), file_name=file_name, mime=mime, key=f"{key}_bytes")
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from benchmarks.gerar_planilha import gerar_base
+from controle_chamados.esquema import COLUNAS_SNAPSHOT
+from controle_chamados.prazo import COL_SITUACAO_PRAZO
+from controle_chamados.saneamento import EXIGIR_PADRAO, derivar_colunas, podar_colunas, recortar_uteis, sanear_base
+
+
+@pytest.fixture(scope="session")
+def base():
+    # planilha sintética do benchmark (caixa misturada, R$ bagunçado, linhas lixo), saneada como na carga, sem arquivo
+    saneada = derivar_colunas(podar_colunas(sanear_base(gerar_base(3000, semente=7)), COLUNAS_SNAPSHOT))
+    return recortar_uteis(saneada, EXIGIR_PADRAO, True)
+
+
+@pytest.fixture(scope="session")
+def sortear_filtros():
+    # combinações aleatórias (reprodutíveis) de filtros com valores reais da base; faixas=True inclui situação/atraso
+    def sortear(df, n, semente=0, textos=True, faixas=False):
+        rng = np.random.default_rng(semente)
+        selecoes = {"coord_sel": "COORDENADOR", "forn_sel": "FORNECEDOR", "projeto_sel": "PROJETO", "status_ticket_sel": "CHAMADO",
+                    "status_pgto_sel": "STATUS RESULT1", "status_rc_sel": "STATUS RC", "prazo_sel": "PRAZO"}
+        if faixas:
+            selecoes["situacao_prazo_sel"] = COL_SITUACAO_PRAZO
+        trechos = {"prazo_texto": ["fora", "DIAS", "no prazo", "efetiv"], "loja_texto": ["LJ1", "lj15", "9"], "pedido_texto": ["45", "0001", "99"]}
+        casos = [{}]
+        for _ in range(n):
+            caso = {}
+            for arg, col in selecoes.items():
+                if rng.random() < 0.3:
+                    valores = df[col].dropna().unique().tolist()
+                    caso[arg] = list(rng.choice(valores, size=min(len(valores), rng.integers(1, 4)), replace=False))
+            for arg, opcoes in trechos.items():
+                if textos and rng.random() < 0.25:
+                    caso[arg] = str(rng.choice(opcoes))
+            if faixas and rng.random() < 0.2:
+                caso["atraso_faixa"] = (int(rng.integers(0, 10)), int(rng.integers(10, 60)))
+            casos.append(caso)
+        return casos
+    return sortear
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from controle_chamados.banco import BaseSQL
+from controle_chamados.busca import IndiceBusca
+from controle_chamados.consulta import FILTROS_VAZIOS, agregar, aplicar_filtros
+from controle_chamados.filtros import MotorFiltros
+from controle_chamados.saneamento import derivar_colunas
+
+CASOS = {
+    "sem_filtro": {},
+    "selecoes_vazias": {"coord_sel": [], "forn_sel": [], "prazo_sel": None},
+    "selecao_inexistente": {"coord_sel": ["NINGUÉM"]},
+    "regex_alternativa": {"prazo_texto": "no prazo|efetiv"},
+    "regex_classe": {"prazo_texto": r"\(1\d dias\)"},
+    "regex_ancora": {"loja_texto": "^lj1[0-4]"},
+    "regex_nao_ascii": {"prazo_texto": "praço|prazo"},
+    "like_literal": {"pedido_texto": "45001"},
+    "like_curinga_literal": {"loja_texto": "lj_1"},  # "_" é literal, não o curinga do LIKE
+    "faixa_atraso": {"atraso_faixa": (5, 20)},
+    "faixa_aberta": {"atraso_faixa": (None, 3)},
+    "busca_livre": {"busca_texto": "patricia"},
+    "combinado": {"situacao_prazo_sel": ["FORA DO PRAZO"], "prazo_texto": "dias", "atraso_faixa": (10, None)},
+}
+EIXOS = [("MÊS", "DATA_PGTO_SAP"), ("MÊS", "DATA CRIAÇÃO TICKET BR"), ("PROJETO", None), ("COORDENADOR", None)]
+
+
+@pytest.fixture(scope="module")
+def base_nulos(base):
+    # datas de pagamento e valores ausentes em parte das linhas (NULL no banco, NaT/NaN no pandas)
+    rng = np.random.default_rng(5)
+    vazias = rng.random(len(base)) < 0.15
+    df = base.assign(**{"DATA_PGTO_SAP": base["DATA_PGTO_SAP"].mask(vazias), "VALOR BI": base["VALOR BI"].mask(~vazias & (rng.random(len(base)) < 0.1))})
+    return derivar_colunas(df)
+
+
+@pytest.fixture(scope="module")
+def bancos(base, base_nulos):
+    abertos = {}
+    for nome, df in (("base", base), ("nulos", base_nulos)):
+        abertos[nome] = BaseSQL(":memory:")
+        abertos[nome].carregar(df, {"teste": nome})
+    yield abertos
+    for b in abertos.values():
+        b.fechar()
+
+
+def _pandas(df, filtros):
+    indice = IndiceBusca(df) if filtros.get("busca_texto") else None
+    return aplicar_filtros(df, **{**FILTROS_VAZIOS, **filtros}, indice_busca=indice, motor=MotorFiltros(df))
+
+
+@pytest.mark.parametrize("nome_base", ["base", "nulos"])
+@pytest.mark.parametrize("caso", list(CASOS))
+def test_filtrar_igual_ao_pandas(request, bancos, nome_base, caso):
+    df = request.getfixturevalue("base" if nome_base == "base" else "base_nulos")
+    filtros = CASOS[caso]
+    esperado = _pandas(df, filtros).reset_index(drop=True)
+    obtido = bancos[nome_base].filtrar(filtros, list(esperado.columns), ordenar=False)
+    assert len(obtido) == len(esperado)
+    if caso == "selecao_inexistente":
+        assert obtido.empty
+    # mesmas linhas, na ordem da base, com os tipos da base (categorias só do recorte)
+    pd.testing.assert_frame_equal(obtido, esperado, check_categorical=False)
+
+
+@pytest.mark.parametrize("nome_base", ["base", "nulos"])
+@pytest.mark.parametrize("caso", list(CASOS))
+@pytest.mark.parametrize("eixo, ref", EIXOS)
+def test_agregar_igual_ao_pandas(request, bancos, nome_base, caso, eixo, ref):
+    df = request.getfixturevalue("base" if nome_base == "base" else "base_nulos")
+    filtros = CASOS[caso]
+    for excluir in (False, True):
+        esperado = agregar(_pandas(df, filtros), eixo, ref, excluir).reset_index(drop=True)
+        obtido = bancos[nome_base].agregar(filtros, eixo, ref, excluir).reset_index(drop=True)
+        # MÊS sem data (NULL) é o último grupo nos dois; somas a menos do arredondamento do float
+        pd.testing.assert_frame_equal(obtido.astype({eixo: object}), esperado.astype({eixo: object}), check_dtype=False)
+
+
+def test_ordem_da_tabela_detalhada(base_nulos, bancos):
+    # ordenar=True: data de pagamento crescente, sem data no fim, empates na ordem da base
+    obtido = bancos["nulos"].filtrar({"coord_sel": [str(base_nulos["COORDENADOR"].dropna().iloc[0])]}, ["PEDIDO", "DATA_PGTO_SAP"])
+    datas = obtido["DATA_PGTO_SAP"]
+    assert datas.isna().sum() > 0 and datas.isna().to_numpy()[-datas.isna().sum():].all()
+    assert datas.dropna().is_monotonic_increasing
+
+
+@pytest.mark.parametrize("filtros", [{"loja_texto": "(lj"}, {"prazo_texto": "dias)"}, {"pedido_texto": "[45"}, {"loja_texto": "*"}])
+def test_regex_invalida_da_erro_claro(base, bancos, filtros):
+    with pytest.raises(ValueError, match="Texto inválido no filtro"):
+        bancos["base"].filtrar(filtros)
+    with pytest.raises(ValueError, match="Texto inválido no filtro"):
+        bancos["base"].agregar(filtros, "PROJETO")
+    # o caminho do pandas dá o mesmo erro
+    with pytest.raises(ValueError, match="Texto inválido no filtro"):
+        _pandas(base, filtros)
+    with pytest.raises(ValueError, match="Texto inválido no filtro"):
+        aplicar_filtros(base, **{**FILTROS_VAZIOS, **filtros})
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from controle_chamados.busca import IndiceBusca, normalizar_texto
+
+ACENTOS = pd.DataFrame({
+    "COORDENADOR": pd.Categorical(["JOÃO", "João Paulo", "joao", None, "PATRÍCIA", "Patricia", "ÂNGELA", "Ângela Maria"]),
+    "FORNECEDOR": ["AÇÚCAR UNIÃO LTDA", "Acucar Uniao", "CONSTRUÇÕES SÃO JOSÉ", None, "ELÉTRICA ÁGUA-VIVA", "eletrica", "Ótica", "ÓTICA  SÃO  PAULO"],
+    "LOJA": ["LJ1", "lj12", None, "LJ1 CENTRO", "lj 3", "LJ3", "LJ30", "Lj300"],
+    "VALOR BI": [1.5, 2.0, np.nan, 10.0, 1234.56, 0.0, 3.25, 99.9],
+    "_SITUACAO": ["não entra", "na busca", "", "", "", "", "", ""],
+})
+
+
+def _textos(df):
+    # referência: texto normalizado de cada linha, colunas "_" de fora
+    cols = [c for c in df.columns if not str(c).startswith("_")]
+    textos = [df[c].dropna().astype(str).map(normalizar_texto).reindex(df.index, fill_value="") for c in cols]
+    return [" ".join(v for v in vals if v) for vals in zip(*textos)]
+
+
+def _varredura(textos, consulta):
+    # a linha entra se o texto dela contém a consulta inteira
+    q = normalizar_texto(consulta).strip()
+    if not q:
+        return np.arange(len(textos))
+    return np.flatnonzero([q in t for t in textos])
+
+
+def _consultas_sorteadas(df, n, semente):
+    # trechos reais do texto das linhas: curtos (< 3), um token e vários tokens (atravessando colunas)
+    rng = np.random.default_rng(semente)
+    textos = [" ".join(str(v) for v in linha if pd.notna(v)) for linha in df.itertuples(index=False)]
+    consultas = []
+    for _ in range(n):
+        t = textos[rng.integers(len(textos))]
+        if not t:
+            continue
+        tam = int(rng.choice([1, 2, 3, 4, 6, 10, 16]))
+        ini = int(rng.integers(0, max(1, len(t) - tam)))
+        trecho = t[ini:ini + tam]
+        consultas.append(trecho.upper() if rng.random() < 0.3 else trecho)
+    return consultas
+
+
+CONSULTAS = [
+    "joão", "JOAO", "joa", "ão", "são", "SAO JOSE", "açúcar união", "acucar uniao ltda", "água-viva", "ótica são",
+    "ótica  são", "a", "ç", "lj", "j", "1", "LJ1", "lj1 centro", "lj 3", "3 ", " lj3 ", "12", "1234.56", "0.0",
+    "paulo joão", "patricia eletrica", "patrícia elé", "maria", "não entra", "busca", "inexistente", "zz", "", "   ",
+]
+
+
+@pytest.mark.parametrize("consulta", CONSULTAS)
+def test_acentos_e_termos(consulta):
+    np.testing.assert_array_equal(IndiceBusca(ACENTOS).buscar(consulta), _varredura(_textos(ACENTOS), consulta))
+
+
+def test_consultas_sorteadas_na_base(base):
+    indice, textos = IndiceBusca(base), _textos(base)
+    for consulta in _consultas_sorteadas(base, 300, semente=3) + CONSULTAS:
+        np.testing.assert_array_equal(indice.buscar(consulta), _varredura(textos, consulta), err_msg=repr(consulta))
+
+
+def test_buscar_em_igual_a_buscar(base):
+    indice = IndiceBusca(base)
+    candidatas = np.arange(0, len(base), 3)
+    for consulta in ["hen", "henrique", "a", "lj1 ", "fornecedor 08", "no prazo"]:
+        esperado = np.intersect1d(candidatas, indice.buscar(consulta))
+        np.testing.assert_array_equal(indice.buscar_em(consulta, candidatas), esperado, err_msg=repr(consulta))
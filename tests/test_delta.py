@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from benchmarks.gerar_planilha import gerar_base
+from controle_chamados import delta, snapshot
+from controle_chamados.saneamento import ler_base_saneada
+
+
+def _linha_cheia(bruto, n=0):
+    # n-ésima linha com PEDIDO preenchido (a planilha sintética tem linhas lixo vazias)
+    return bruto.index[bruto["PEDIDO"].notna()][n]
+
+
+def _inserir(bruto):
+    i = _linha_cheia(bruto, 5)
+    nova = bruto.loc[[i]].assign(PEDIDO="4509999999", NOTA="77777", FORNECEDOR="FORNECEDOR NOVO")
+    return pd.concat([bruto.loc[:i], nova, bruto.loc[i + 1:]], ignore_index=True)
+
+
+def _remover(bruto):
+    return bruto.drop(index=[_linha_cheia(bruto, 3), _linha_cheia(bruto, 40)]).reset_index(drop=True)
+
+
+def _editar(bruto):
+    bruto = bruto.copy()
+    i, j = _linha_cheia(bruto, 7), _linha_cheia(bruto, 20)
+    bruto.loc[i, "VALOR BI"] = "1.234,56"
+    bruto.loc[j, "CHAMADO"] = "FECHADO"
+    bruto.loc[j, "DATA_PGTO_SAP"] = None
+    return bruto
+
+
+def _duplicar_chave(bruto):
+    # mesma PEDIDO+NOTA de uma linha existente, com conteúdo diferente, e uma cópia idêntica de outra linha
+    i, j = _linha_cheia(bruto, 2), _linha_cheia(bruto, 11)
+    outra = bruto.loc[[i]].assign(**{"VALOR BI": "9,99"})
+    return pd.concat([bruto, outra, bruto.loc[[j]]], ignore_index=True)
+
+
+EDICOES = {"insercao": _inserir, "remocao": _remover, "edicao": _editar, "chave_duplicada": _duplicar_chave}
+
+
+@pytest.fixture
+def pasta_cache(tmp_path, monkeypatch):
+    # snapshots num diretório temporário (o ler_base_saneada grava o Parquet e o ponteiro "ultimo_*")
+    def trocar(pasta):
+        monkeypatch.setattr(snapshot, "DIR_SNAPSHOT", str(pasta))
+        monkeypatch.setattr(delta, "DIR_SNAPSHOT", str(pasta))
+    return trocar
+
+
+def _ler(caminho, conteudo, bruto):
+    # o bruto vem pronto; o arquivo só muda de bytes para a chave do snapshot ser outra a cada versão
+    caminho.write_bytes(conteudo)
+    return ler_base_saneada(str(caminho), "Planilha1", bruto=bruto)
+
+
+@pytest.mark.parametrize("edicao", EDICOES)
+def test_recarga_delta_igual_a_completa(edicao, tmp_path, pasta_cache):
+    bruto = gerar_base(600, semente=3)
+    novo = EDICOES[edicao](bruto)
+    arquivo = tmp_path / "base.xlsx"
+
+    pasta_cache(tmp_path / "delta")
+    _ler(arquivo, b"v1", bruto)
+    incremental = _ler(arquivo, b"v2", novo)
+    assert "delta" in incremental.attrs
+
+    pasta_cache(tmp_path / "completa")
+    completa = _ler(arquivo, b"v2", novo)
+    assert "delta" not in completa.attrs
+
+    pd.testing.assert_frame_equal(incremental, completa)
+
+
+@pytest.mark.parametrize("edicao,esperado", [
+    ("insercao", {"inseridos": 1, "atualizados": 0, "removidos": 0}),
+    ("remocao", {"inseridos": 0, "atualizados": 0, "removidos": 2}),
+    ("edicao", {"inseridos": 0, "atualizados": 2, "removidos": 0}),
+    # chave que passa a se repetir desempata pelo conteúdo: as linhas originais também trocam de chave
+    ("chave_duplicada", {"inseridos": 4, "atualizados": 0, "removidos": 2}),
+])
+def test_contagem_do_delta(edicao, esperado, tmp_path, pasta_cache):
+    bruto = gerar_base(600, semente=3)
+    arquivo = tmp_path / "base.xlsx"
+    pasta_cache(tmp_path)
+    _ler(arquivo, b"v1", bruto)
+    assert _ler(arquivo, b"v2", EDICOES[edicao](bruto)).attrs["delta"] == esperado
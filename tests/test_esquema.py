@@ -0,0 +1,18 @@
+import pandas as pd
+
+from controle_chamados.esquema import relatorio_memoria
+
+
+def test_relatorio_memoria_compara_com_object(base):
+    memoria = relatorio_memoria(base).set_index("COLUNA")
+    for c in ["VALOR BI", "DATA_PGTO_SAP", "COORDENADOR", "PEDIDO"]:
+        assert memoria.loc[c, "BYTES_OBJECT"] == base[c].astype(object).memory_usage(deep=True, index=False)
+        assert memoria.loc[c, "ECONOMIA"] > 0, c
+    derivadas = memoria[memoria.index.str.startswith("_")]
+    assert len(derivadas) and (derivadas["ECONOMIA"] == 0).all()
+    assert memoria["ECONOMIA"].sum() == memoria["BYTES_OBJECT"].sum() - memoria["BYTES"].sum()
+
+
+def test_relatorio_memoria_coluna_ja_object():
+    df = pd.DataFrame({"OBS": pd.Series(["a", None, "texto longo"], dtype=object)})
+    assert relatorio_memoria(df).loc[0, "ECONOMIA"] == 0
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from controle_chamados.busca import IndiceBusca
+from controle_chamados.consulta import FILTROS_VAZIOS
+from controle_chamados.filtros import ARGS_SELECAO, RE_METACARACTERES, MemoFiltros, MotorFiltros, interseccao, montar_selecoes
+from controle_chamados.prazo import COL_DIAS_ATRASO
+
+TEXTOS = {"prazo_texto": "PRAZO", "loja_texto": "LOJA", "pedido_texto": "PEDIDO", "busca_texto": "FORNECEDOR"}
+
+
+@pytest.fixture(scope="module")
+def motor(base):
+    return MotorFiltros(base)
+
+
+@pytest.fixture(scope="module")
+def indice(base):
+    return IndiceBusca(base)
+
+
+def _completo(motor, indice, f, n):
+    # caminho sem memo: todas as posições pré-indexadas de novo, a partir da base inteira
+    pos = motor.posicoes(
+        selecoes=montar_selecoes(f["coord_sel"], f["forn_sel"], f["projeto_sel"], f["status_ticket_sel"], f["status_pgto_sel"],
+                                 f["status_rc_sel"], f["prazo_sel"], f["situacao_prazo_sel"]),
+        textos={"PRAZO": f["prazo_texto"], "LOJA": f["loja_texto"], "PEDIDO": f["pedido_texto"]},
+        faixas={COL_DIAS_ATRASO: f["atraso_faixa"]},
+    )
+    if f["busca_texto"]:
+        pos = interseccao(pos, indice.buscar(f["busca_texto"]))
+    return np.arange(n) if pos is None else np.asarray(pos)
+
+
+def _editar(f, base, rng):
+    # uma edição da barra lateral: marca/desmarca um valor, estende/encurta/limpa um texto ou mexe na faixa
+    f = dict(f)
+    tipo = rng.choice(["selecao", "texto", "faixa", "limpar"], p=[0.45, 0.35, 0.1, 0.1])
+    if tipo == "selecao":
+        arg = str(rng.choice(list(ARGS_SELECAO)))
+        atuais = list(f[arg])
+        if atuais and rng.random() < 0.4:
+            atuais.remove(atuais[rng.integers(len(atuais))])
+        else:
+            atuais.append(str(rng.choice(base[ARGS_SELECAO[arg]].dropna().unique())))
+        f[arg] = atuais
+    elif tipo == "texto":
+        arg = str(rng.choice(list(TEXTOS)))
+        # trechos literais (sem metacaracteres de regex), como quem digita um pedaço do valor
+        alvo = RE_METACARACTERES.sub("", str(rng.choice(base[TEXTOS[arg]].dropna().astype(str).unique()))).lower()
+        atual = f[arg]
+        if not alvo:
+            return f
+        if atual and alvo.startswith(atual) and len(alvo) > len(atual):
+            f[arg] = alvo[:len(atual) + 1]  # digitou mais uma letra: estreita o anterior
+        elif atual and rng.random() < 0.5:
+            f[arg] = atual[:-1]  # apagou uma letra: alarga
+        else:
+            inicio = rng.integers(len(alvo))
+            f[arg] = alvo[inicio:inicio + rng.integers(1, 4)]
+    elif tipo == "faixa":
+        minimo, maximo = f["atraso_faixa"] or (0, 60)
+        f["atraso_faixa"] = (minimo + int(rng.integers(-2, 5)), maximo - int(rng.integers(-2, 10)))
+    else:
+        f = dict(FILTROS_VAZIOS)
+    return f
+
+
+@pytest.mark.parametrize("semente", range(4))
+def test_memo_igual_ao_caminho_completo(base, motor, indice, semente):
+    rng = np.random.default_rng(semente)
+    memo, filtros, caminhos = MemoFiltros(), dict(FILTROS_VAZIOS), []
+    for _ in range(150):
+        filtros = _editar(filtros, base, rng)
+        pos = memo.posicoes("v1", filtros, motor, indice)
+        obtido = np.arange(len(base)) if pos is None else np.asarray(pos)
+        np.testing.assert_array_equal(obtido, _completo(motor, indice, filtros, len(base)), err_msg=str(filtros))
+        caminhos.append(memo.ultimo)
+    # a sequência passa pelos três caminhos do memo, inclusive o refinamento
+    assert {"memo", "refinado", "completo"} <= set(caminhos)
+
+
+def test_memo_nao_refina_entre_versoes(base, motor, indice):
+    memo = MemoFiltros()
+    coord = [str(base["COORDENADOR"].dropna().iloc[0])]
+    memo.posicoes("v1", {**FILTROS_VAZIOS, "coord_sel": coord}, motor, indice)
+    memo.posicoes("v2", {**FILTROS_VAZIOS, "coord_sel": coord, "loja_texto": "1"}, motor, indice)
+    assert memo.ultimo == "completo"
@@ -0,0 +1,25 @@
+import pandas as pd
+
+from controle_chamados.indicadores import calcular_indicadores
+from controle_chamados.saneamento import derivar_colunas
+
+
+def _base():
+    return pd.DataFrame({
+        "DATA CRIAÇÃO TICKET BR": pd.to_datetime(["2024-01-01", None, None, "2024-03-01"]),
+        "DATA CRIAÇÃO TICKET": pd.to_datetime(["2023-12-01", "2024-01-05", None, None]),
+        "DATA_PGTO_SAP": pd.to_datetime(["2024-01-11", "2024-01-25", "2024-02-01", None]),
+    })
+
+
+def test_dias_ate_pagamento_usa_data_ticket_como_reserva():
+    # 10 dias pela data BR (a original é ignorada onde a BR existe) e 20 pela original; sem abertura ou sem pagamento não conta
+    assert calcular_indicadores(_base(), ["dias_ate_pagamento"]) == {"dias_ate_pagamento": 15.0}
+
+
+def test_dias_ate_pagamento_igual_com_colunas_derivadas():
+    assert calcular_indicadores(derivar_colunas(_base()), ["dias_ate_pagamento"]) == {"dias_ate_pagamento": 15.0}
+
+
+def test_dias_ate_pagamento_sem_datas():
+    assert calcular_indicadores(_base().drop(columns=["DATA_PGTO_SAP"]), ["dias_ate_pagamento"]) == {"dias_ate_pagamento": None}
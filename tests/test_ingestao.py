@@ -0,0 +1,100 @@
+import re, zipfile
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill
+
+from controle_chamados.ingestao import ERROS_EXCEL, ler_planilha
+
+ABA = "Base"
+ABA_SEM_MEIO = "SoFim"  # linhas vazias só no fim da aba
+COLUNAS = ["PEDIDO", "VALOR BI", "PRAZO", "DATA_PGTO_SAP", "MISTA", "FORMULA"]
+
+
+def _com_valores_em_cache(caminho, valores):
+    # o openpyxl grava fórmulas sem o valor calculado; o Excel grava os dois (<f> e <v>): imita o Excel
+    with zipfile.ZipFile(caminho) as z:
+        partes = {n: z.read(n) for n in z.namelist()}
+    xml = partes["xl/worksheets/sheet1.xml"].decode("utf-8")
+    for ref, valor in valores.items():
+        tipo = (' t="e"' if valor in ERROS_EXCEL else ' t="str"') if isinstance(valor, str) else ""
+        xml = re.sub(rf'<c r="{ref}"([^>]*)><f>(.*?)</f>(?:<v\s*/>|<v></v>)?</c>', rf'<c r="{ref}"\1{tipo}><f>\2</f><v>{valor}</v></c>', xml)
+    partes["xl/worksheets/sheet1.xml"] = xml.encode("utf-8")
+    with zipfile.ZipFile(caminho, "w", zipfile.ZIP_DEFLATED) as z:
+        for nome, dados in partes.items():
+            z.writestr(nome, dados)
+
+
+@pytest.fixture(scope="module")
+def planilha(tmp_path_factory):
+    caminho = str(tmp_path_factory.mktemp("ingestao") / "base.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.title = ABA
+    # cabeçalho com caixa/espaços variados, coluna fora da lista e nome repetido (vale o primeiro)
+    ws.append([" pedido", "Valor BI", "OBS", "prazo ", "DATA_PGTO_SAP", "mista", "FORMULA", "PEDIDO"])
+    linhas = [
+        [4500000001, 1234.5, "x", "no prazo", datetime(2025, 3, 1), 10, None, 1],
+        [4500000002, 99.0, None, "fora do prazo (3 dias)", datetime(2025, 3, 2), "texto", None, 2],
+        [None, None, "só fora da lista", None, None, None, None, None],  # vazia nas colunas lidas
+        ["4500000004", "1.234,56", None, "#N/A", "02/03/2025", 2.5, None, None],
+        [4500000005, 0, None, None, None, datetime(2025, 1, 1), None, None],
+        [None] * 8,  # linha vazia no meio
+        [4500000007, -3.25, None, "pagamento efetivado", datetime(2025, 4, 30), True, None, None],
+    ]
+    for linha in linhas:
+        ws.append(linha)
+    formulas = {"G2": ("=B2*2", 2469), "G3": ('=D3&"!"', "fora do prazo (3 dias)!"), "G5": ("=1/0", "#DIV/0!"), "G8": ("=B8+1", -2.25)}
+    for ref, (formula, _) in formulas.items():
+        ws[ref] = formula
+    # linhas finais só com formatação (sem valor): o Excel as guarda no XML
+    cinza = PatternFill("solid", fgColor="DDDDDD")
+    for lin in range(len(linhas) + 2, len(linhas) + 12):
+        for col in range(1, 9):
+            ws.cell(row=lin, column=col).fill = cinza
+    fim = wb.create_sheet(ABA_SEM_MEIO)
+    fim.append(["PEDIDO", "MISTA"])
+    for i in range(5):
+        fim.append([4500000000 + i, i])
+    for lin in range(7, 12):
+        fim.cell(row=lin, column=1).fill = cinza
+    wb.save(caminho)
+    _com_valores_em_cache(caminho, {ref: v for ref, (_, v) in formulas.items()})
+    return caminho
+
+
+def _referencia(caminho, colunas, aba=ABA):
+    # pd.read_excel da mesma aba, com as regras de ler_planilha: cabeçalho em UPPER, colunas pedidas
+    # (o primeiro nome repetido) e sem as linhas vazias nelas
+    df = pd.read_excel(caminho, sheet_name=aba)
+    df.columns = [str(c).strip().upper() for c in df.columns]
+    df = df.loc[:, ~df.columns.duplicated()]
+    df = df[[c for c in df.columns if c in colunas]]
+    return df.dropna(how="all").reset_index(drop=True)
+
+
+def test_streaming_igual_ao_read_excel(planilha):
+    lido = ler_planilha(planilha, ABA, colunas=COLUNAS)
+    esperado = _referencia(planilha, COLUNAS)
+    assert list(lido.columns) == ["PEDIDO", "VALOR BI", "PRAZO", "DATA_PGTO_SAP", "MISTA", "FORMULA"]
+    pd.testing.assert_frame_equal(lido, esperado)
+
+
+def test_formulas_com_valor_calculado(planilha):
+    lido = ler_planilha(planilha, ABA, colunas=COLUNAS)
+    assert lido["FORMULA"].tolist()[:2] == [2469, "fora do prazo (3 dias)!"]
+    assert lido["FORMULA"].isna().tolist() == [False, False, True, True, False]  # #DIV/0! vira NaN
+
+
+@pytest.mark.parametrize("colunas", [["PRAZO"], ["MISTA", "PEDIDO"], ["INEXISTENTE"]])
+def test_streaming_subconjunto_de_colunas(planilha, colunas):
+    pd.testing.assert_frame_equal(ler_planilha(planilha, ABA, colunas=colunas), _referencia(planilha, colunas))
+
+
+def test_linhas_vazias_so_no_fim(planilha):
+    # o read_excel corta as linhas vazias do fim: inteiros seguem inteiros
+    lido = ler_planilha(planilha, ABA_SEM_MEIO, colunas=COLUNAS)
+    assert lido["PEDIDO"].dtype == "int64"
+    pd.testing.assert_frame_equal(lido, _referencia(planilha, COLUNAS, ABA_SEM_MEIO))
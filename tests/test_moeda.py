@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from controle_chamados.moeda import converter_colunas_moeda, converter_moeda_serie, formatar_moeda_val, to_numeric_safe
+
+# formatos que aparecem (ou já apareceram) nas colunas VALOR da planilha
+CORPUS = [
+    # número limpo
+    "48500", "17339.93", "0", "-12", ".5", "7.", "0012,50",
+    # separador de milhar / vírgula decimal
+    "1.234,56", "1,234.56", "1.234.567,89", "1,234,567.89", "1.234", "1,5", "12,345", "1.234.567",
+    # R$ e espaços (inclusive nbsp)
+    "R$ 1.234,56", "R$1.234,56", "R$ 48500", "R$\xa01.234,56", " 1 234,56 ", "1\xa0234,56", "r$ 10,00",
+    "R$ -1.234,56", "-R$ 1.234,56", "1.234,56 BRL",
+    # negativos entre parênteses e sinais
+    "(1.234,56)", "(R$ 1.234,56)", "(500)", "--5", "5-", "1.234,56-",
+    # vazios
+    "", " ", "nan", "NaN", "None", "NONE", None, np.nan,
+    # texto
+    "abc", "R$", "-", ",", ".", "a definir", "1,2,3", "1.2.3", "1e5", "12,34,56.7",
+    # dígitos não ASCII
+    "١٢٣", "１２３,４５",
+    # já numéricos
+    48500, 17339.93, -0.5,
+]
+
+
+def _igual(a: float, b: float) -> bool:
+    return (math.isnan(a) and math.isnan(b)) or a == b
+
+
+@pytest.mark.parametrize("valor", CORPUS, ids=repr)
+def test_vetorizado_igual_ao_escalar(valor):
+    esperado = to_numeric_safe(valor)
+    obtido = converter_moeda_serie(pd.Series([valor], dtype=object)).iloc[0]
+    assert _igual(obtido, esperado)
+
+
+def test_corpus_inteiro_numa_serie():
+    # caminhos rápido, vetorizado e escalar misturados na mesma série (índice e nome preservados)
+    serie = pd.Series(CORPUS, dtype=object, index=range(100, 100 + len(CORPUS)), name="VALOR RC")
+    obtido = converter_moeda_serie(serie)
+    assert obtido.dtype == "float64"
+    assert obtido.name == "VALOR RC"
+    assert obtido.index.equals(serie.index)
+    assert all(_igual(o, to_numeric_safe(v)) for o, v in zip(obtido, CORPUS))
+
+
+@pytest.mark.parametrize("texto, valor", [
+    ("R$ 1.234,56", 1234.56),
+    ("1,234.56", 1.23456),  # com vírgula e ponto, o ponto é sempre milhar (padrão BR)
+    ("1.234", 1.234),
+    ("(1.234,56)", 1234.56),  # parênteses caem junto com o resto do texto: o sinal não é lido
+    ("R$ -1.234,56", -1234.56),
+    ("", None),
+    ("a definir", None),
+])
+def test_valores_de_referencia(texto, valor):
+    obtido = converter_moeda_serie(pd.Series([texto])).iloc[0]
+    assert math.isnan(obtido) if valor is None else obtido == pytest.approx(valor)
+
+
+def test_coluna_ja_convertida_nao_e_relida():
+    serie = pd.Series([1.5, np.nan], dtype="float64")
+    pd.testing.assert_series_equal(converter_moeda_serie(serie), serie)
+
+
+def test_converter_colunas_moeda():
+    df = pd.DataFrame({"VALOR RC": ["R$ 10,00", None], "VALOR BI": ["1.000,50", "x"], "LOJA": ["1", "2"]})
+    f = converter_colunas_moeda(df)
+    assert f["VALOR RC"].tolist()[0] == 10.0 and math.isnan(f["VALOR RC"].tolist()[1])
+    assert f["VALOR BI"].tolist()[0] == 1000.5
+    assert f["LOJA"].tolist() == ["1", "2"]
+
+
+def test_formatar_moeda_val():
+    assert formatar_moeda_val(1234.5) == "R$1.234,50"
+    assert formatar_moeda_val("R$ 1.234,56") == "R$1.234,56"
+    assert formatar_moeda_val(None) == ""